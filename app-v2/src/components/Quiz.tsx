@@ -3,6 +3,7 @@ import { motion, AnimatePresence } from 'framer-motion'
 import confetti from 'canvas-confetti'
 import { useQuizConfig } from '../contexts/QuizConfigContext'
 import { useAvatar } from '../contexts/AvatarContext'
+import type { SourceParagraph } from '../services/related'
 
 type Question = {
   question: string
@@ -12,7 +13,7 @@ type Question = {
   hint?: string
 }
 
-export default function Quiz({ questions, onSubmit, onSaveComment, lessonId }: { questions: Question[], onSubmit?: (score:number, answers:number[])=>void, onSaveComment?: (comment: string)=>void, lessonId?: number }) {
+export default function Quiz({ questions, onSubmit, onSaveComment, lessonId, sources }: { questions: Question[], onSubmit?: (score:number, answers:number[])=>void, onSaveComment?: (comment: string)=>void, lessonId?: number, sources?: (SourceParagraph | null)[] }) {
   const [answers, setAnswers] = React.useState<number[]>(Array(questions.length).fill(-1))
   const [submitted, setSubmitted] = React.useState(false)
   const [comment, setComment] = React.useState('')
@@ -346,6 +347,11 @@ export default function Quiz({ questions, onSubmit, onSaveComment, lessonId }: {
                         <strong>Obrazložitev:</strong> {q.explanation}
                       </p>
                     )}
+                    {!correct && sources?.[qi] && (
+                      <p className="review-explanation">
+                        <strong>Ponovi ({sources[qi]!.section}):</strong> {sources[qi]!.text}
+                      </p>
+                    )}
                   </motion.div>
                 )
               })}
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Precompute related-content links for the frontend
+For every language writes related-{lang}.json next to the lesson files with:
+  - questions: lesson slug -> per quiz question [section, paragraph, score] of the
+    best-matching paragraph in the same lesson (paragraphs split like buildRows in
+    src/services/search.ts, so indexes line up with the frontend rows)
+  - lessons: lesson slug -> top-k related lessons [[slug, score], ...]
+Similarity is TF-IDF cosine over diacritic-folded, prefix-stemmed words.
+src/services/related.ts loads the file and answers lookups by key.
+
+Usage:
+    python build_related_content.py
+    python build_related_content.py --k 8 --lang sl
+"""
+
+import argparse
+import json
+import math
+import re
+import time
+import unicodedata
+from collections import Counter
+from pathlib import Path
+
+BASE_PATH = Path(__file__).parent
+
+LANGUAGES = ['sl', 'en', 'hr']
+
+# Same files cms.ts loads per language (main + advanced)
+SOURCES = ['annex1-{lang}.json', 'annex1-advanced-{lang}.json']
+
+# Lesson sections in the order buildRows() walks them; questions refer to them by index
+SECTIONS = ['developmentAndExplanation', 'practicalChallenges', 'improvementIdeas']
+
+# Words are cut to this many characters - a cheap stemmer that merges most
+# Slovenian/Croatian case endings and English plurals
+STEM_LENGTH = 6
+
+# Shorter words carry no topic (articles, prepositions, "je", "in", "the")
+MIN_WORD_LENGTH = 3
+
+# Title words count this many times in the lesson-level vector
+TITLE_BOOST = 3
+
+# Links below this cosine similarity are dropped
+MIN_SCORE = 0.05
+
+# Letters without a Unicode decomposition (same as build_knowledge_index.py)
+EXTRA_FOLD = str.maketrans({'đ': 'd', 'Đ': 'D', 'ł': 'l', 'Ł': 'L', 'ø': 'o', 'Ø': 'O', 'ß': 'ss'})
+
+WORD_RE = re.compile(r'[a-z0-9]+')
+
+def terms(text):
+    """
+    Lowercased, diacritic-folded, prefix-stemmed words of text
+    """
+    folded = unicodedata.normalize('NFD', (text or '').translate(EXTRA_FOLD).lower())
+    folded = ''.join(c for c in folded if not unicodedata.combining(c))
+    return [w[:STEM_LENGTH] for w in WORD_RE.findall(folded) if len(w) >= MIN_WORD_LENGTH]
+
+def paragraphs(text):
+    """
+    Non-empty trimmed lines, exactly as buildRows() splits a section
+    """
+    return [p.strip() for p in (text or '').split('\n') if p.strip()]
+
+def load_lessons(lang):
+    lessons = []
+    for pattern in SOURCES:
+        path = BASE_PATH / pattern.format(lang=lang)
+        if path.exists():
+            with open(path, 'r', encoding='utf-8') as f:
+                lessons.extend(json.load(f))
+    return lessons
+
+def idf_table(documents):
+    """
+    Smoothed inverse document frequency over a list of term lists
+    """
+    df = Counter()
+    for doc in documents:
+        df.update(set(doc))
+    n = len(documents)
+    return {term: math.log((1 + n) / (1 + count)) + 1 for term, count in df.items()}
+
+def vector(doc, idf):
+    """
+    L2-normalised sublinear TF-IDF vector as a dict
+    """
+    weights = {t: (1 + math.log(c)) * idf.get(t, 0.0) for t, c in Counter(doc).items()}
+    norm = math.sqrt(sum(w * w for w in weights.values()))
+    if not norm:
+        return {}
+    return {t: w / norm for t, w in weights.items()}
+
+def cosine(a, b):
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(w * b.get(t, 0.0) for t, w in a.items())
+
+def question_text(q):
+    """
+    Question, correct answer and explanation - what the paragraph has to explain
+    """
+    options = q.get('options') or []
+    index = q.get('correctAnswerIndex')
+    correct = options[index] if isinstance(index, int) and 0 <= index < len(options) else ''
+    return ' '.join([q.get('question') or '', correct, q.get('explanation') or ''])
+
+def lesson_text(lesson):
+    parts = [lesson.get('title') or ''] * TITLE_BOOST
+    parts.append(lesson.get('annexReference') or '')
+    parts.extend(lesson.get(section) or '' for section in SECTIONS)
+    parts.extend(question_text(q) for q in lesson.get('quizQuestions') or [])
+    return ' '.join(parts)
+
+def link_questions(lessons):
+    """
+    For each lesson, best paragraph [section, paragraph, score] per quiz question
+    (None when nothing in the lesson reaches MIN_SCORE)
+    """
+    lesson_paragraphs = []
+    for lesson in lessons:
+        rows = []
+        for s, section in enumerate(SECTIONS):
+            for p, text in enumerate(paragraphs(lesson.get(section))):
+                rows.append((s, p, terms(text)))
+        lesson_paragraphs.append(rows)
+
+    # IDF over every paragraph of the language so common words weigh little everywhere
+    idf = idf_table([row[2] for rows in lesson_paragraphs for row in rows])
+
+    links = {}
+    for lesson, rows in zip(lessons, lesson_paragraphs):
+        vectors = [(s, p, vector(doc, idf)) for s, p, doc in rows]
+        matches = []
+        for q in lesson.get('quizQuestions') or []:
+            qv = vector(terms(question_text(q)), idf)
+            best = max(((cosine(qv, pv), s, p) for s, p, pv in vectors), default=(0.0, 0, 0))
+            matches.append([best[1], best[2], round(best[0], 3)] if best[0] >= MIN_SCORE else None)
+        links[lesson['slug']] = matches
+    return links
+
+def link_lessons(lessons, k):
+    """
+    Top-k most similar other lessons per lesson
+    """
+    docs = [terms(lesson_text(lesson)) for lesson in lessons]
+    idf = idf_table(docs)
+    vectors = [vector(doc, idf) for doc in docs]
+
+    links = {}
+    for i, lesson in enumerate(lessons):
+        scored = sorted(((cosine(vectors[i], vectors[j]), lessons[j]['slug'])
+                         for j in range(len(lessons)) if j != i), reverse=True)
+        links[lesson['slug']] = [[slug, round(score, 3)] for score, slug in scored[:k] if score >= MIN_SCORE]
+    return links
+
+def build(lang, k):
+    lessons = load_lessons(lang)
+    return {
+        'lang': lang,
+        'k': k,
+        'sections': SECTIONS,
+        'lessons': link_lessons(lessons, k),
+        'questions': link_questions(lessons),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute question→paragraph and lesson→lesson links")
+    parser.add_argument('--k', type=int, default=5, help="related lessons per lesson (default: 5)")
+    parser.add_argument('--lang', choices=LANGUAGES, help="only this language (default: all)")
+    args = parser.parse_args()
+
+    print("\n" + "="*70)
+    print("RELATED CONTENT GRAPH")
+    print("="*70)
+
+    for lang in [args.lang] if args.lang else LANGUAGES:
+        start = time.perf_counter()
+        graph = build(lang, args.k)
+        output = BASE_PATH / f'related-{lang}.json'
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(graph, f, ensure_ascii=False, separators=(',', ':'))
+
+        questions = [m for matches in graph['questions'].values() for m in matches]
+        linked = sum(1 for m in questions if m)
+        print(f"\n📄 {output.name} [{lang.upper()}]")
+        print(f"   Lessons:   {len(graph['lessons'])}")
+        print(f"   Questions: {linked}/{len(questions)} linked to a paragraph")
+        print(f"   Size:      {output.stat().st_size / 1024:.1f} KB, built in {time.perf_counter() - start:.2f}s")
+
+    print("\n" + "="*70 + "\n")
+
+if __name__ == '__main__':
+    main()
@@ -6,9 +6,23 @@ Uses deep-translator library with Google Translate
 """
 
 import json
+import sys
 import time
 from pathlib import Path
-from deep_translator import GoogleTranslator
+
+from translation_google import translate_text
+
+# Fixed pauses (seconds) between fields to avoid Google Translate rate limits
+FIELD_PAUSE = 0.3
+CONTENT_PAUSE = 0.5
+
+# Translation tasks run by main(): [(input, output, language)]
+TASKS = [
+    ('annex1-sl.json', 'annex1-en.json', 'en'),
+    ('annex1-advanced-sl.json', 'annex1-advanced-en.json', 'en'),
+    ('annex1-sl.json', 'annex1-hr.json', 'hr'),
+    ('annex1-advanced-sl.json', 'annex1-advanced-hr.json', 'hr'),
+]
 
 # Technical terms that should NOT be translated
 TECHNICAL_TERMS = {
@@ -38,72 +52,6 @@ TECHNICAL_TERMS = {
     'EU': 'EU'
 }
 
-def translate_text(text, target_lang='en', chunk_size=3000):
-    """
-    Translate text in chunks to avoid API limits
-    """
-    if not text or len(text.strip()) == 0:
-        return text
-    
-    # Split by paragraphs first
-    paragraphs = text.split('\n\n')
-    translated_paragraphs = []
-    
-    for para in paragraphs:
-        if len(para.strip()) == 0:
-            translated_paragraphs.append(para)
-            continue
-            
-        # If paragraph is too long, split by sentences
-        if len(para) > chunk_size:
-            sentences = para.split('. ')
-            current_chunk = []
-            current_length = 0
-            
-            for sentence in sentences:
-                if current_length + len(sentence) > chunk_size and current_chunk:
-                    chunk_text = '. '.join(current_chunk) + '.'
-                    try:
-                        translator = GoogleTranslator(source='sl', target=target_lang)
-                        translated = translator.translate(chunk_text)
-                        translated_paragraphs.append(translated)
-                        time.sleep(1.5)  # Longer delay to avoid rate limits
-                    except Exception as e:
-                        print(f"      Warning: {e}, using original text")
-                        translated_paragraphs.append(chunk_text)
-                        time.sleep(3)  # Even longer delay after error
-                    
-                    current_chunk = [sentence]
-                    current_length = len(sentence)
-                else:
-                    current_chunk.append(sentence)
-                    current_length += len(sentence)
-            
-            if current_chunk:
-                chunk_text = '. '.join(current_chunk)
-                try:
-                    translator = GoogleTranslator(source='sl', target=target_lang)
-                    translated = translator.translate(chunk_text)
-                    translated_paragraphs.append(translated)
-                    time.sleep(1.5)
-                except Exception as e:
-                    print(f"      Warning: {e}, using original text")
-                    translated_paragraphs.append(chunk_text)
-                    time.sleep(3)
-        else:
-            # Paragraph is short enough, translate directly
-            try:
-                translator = GoogleTranslator(source='sl', target=target_lang)
-                translated = translator.translate(para)
-                translated_paragraphs.append(translated)
-                time.sleep(1)
-            except Exception as e:
-                print(f"      Warning: {e}, using original text")
-                translated_paragraphs.append(para)
-                time.sleep(3)
-    
-    return '\n\n'.join(translated_paragraphs)
-
 def translate_lesson(lesson, target_lang='en'):
     """
     Translate a single lesson
@@ -115,7 +63,7 @@ def translate_lesson(lesson, target_lang='en'):
     # Translate title
     try:
         translated['title'] = translate_text(lesson['title'], target_lang)
-        time.sleep(0.3)
+        time.sleep(FIELD_PAUSE)
     except Exception as e:
         print(f"    Error translating title: {e}")
     
@@ -123,7 +71,7 @@ def translate_lesson(lesson, target_lang='en'):
     if lesson.get('annexReference'):
         try:
             translated['annexReference'] = translate_text(lesson['annexReference'], target_lang)
-            time.sleep(0.3)
+            time.sleep(FIELD_PAUSE)
         except Exception as e:
             print(f"    Error translating annexReference: {e}")
     
@@ -134,7 +82,7 @@ def translate_lesson(lesson, target_lang='en'):
             print(f"    Translating {field}...")
             try:
                 translated[field] = translate_text(lesson[field], target_lang)
-                time.sleep(0.5)
+                time.sleep(CONTENT_PAUSE)
             except Exception as e:
                 print(f"    Error translating {field}: {e}")
     
@@ -149,23 +97,23 @@ def translate_lesson(lesson, target_lang='en'):
             try:
                 # Translate question
                 translated_q['question'] = translate_text(q['question'], target_lang)
-                time.sleep(0.3)
+                time.sleep(FIELD_PAUSE)
                 
                 # Translate options
                 translated_q['options'] = [
                     translate_text(opt, target_lang) for opt in q['options']
                 ]
-                time.sleep(0.3)
+                time.sleep(FIELD_PAUSE)
                 
                 # Translate explanation
                 if q.get('explanation'):
                     translated_q['explanation'] = translate_text(q['explanation'], target_lang)
-                    time.sleep(0.3)
+                    time.sleep(FIELD_PAUSE)
                 
                 # Translate hint
                 if q.get('hint'):
                     translated_q['hint'] = translate_text(q['hint'], target_lang)
-                    time.sleep(0.3)
+                    time.sleep(FIELD_PAUSE)
                 
             except Exception as e:
                 print(f"      Error translating question {i+1}: {e}")
@@ -206,33 +154,18 @@ def translate_file(input_file, output_file, target_lang='en'):
 def main():
     base_path = Path(__file__).parent
     
-    # Translate main lessons to English
-    translate_file(
-        base_path / 'annex1-sl.json',
-        base_path / 'annex1-en.json',
-        'en'
-    )
-    
-    # Translate advanced lessons to English
-    translate_file(
-        base_path / 'annex1-advanced-sl.json',
-        base_path / 'annex1-advanced-en.json',
-        'en'
-    )
-    
-    # Translate main lessons to Croatian
-    translate_file(
-        base_path / 'annex1-sl.json',
-        base_path / 'annex1-hr.json',
-        'hr'
-    )
-    
-    # Translate advanced lessons to Croatian
-    translate_file(
-        base_path / 'annex1-advanced-sl.json',
-        base_path / 'annex1-advanced-hr.json',
-        'hr'
-    )
+    if '--plan' in sys.argv[1:]:
+        # Dry run: estimate requests, characters and time without calling Google
+        from translation_plan import plan_tasks, print_plan
+        print_plan(plan_tasks(TASKS, base_path, backend='google'))
+        return
+    
+    for input_name, output_name, lang in TASKS:
+        translate_file(
+            base_path / input_name,
+            base_path / output_name,
+            lang
+        )
     
     print("\n" + "="*60)
     print("ALL TRANSLATIONS COMPLETE!")
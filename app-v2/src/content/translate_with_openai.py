@@ -5,78 +5,122 @@ Script to translate lesson content using OpenAI GPT-4
 Better for technical/medical terminology and long texts
 """
 
+import argparse
 import json
 import time
 from pathlib import Path
-from openai import OpenAI
 
-# Initialize OpenAI client - You need to set OPENAI_API_KEY environment variable
-# or replace 'your-api-key-here' with your actual API key
-try:
-    client = OpenAI()  # Uses OPENAI_API_KEY from environment
-except:
-    print("ERROR: OpenAI API key not found!")
-    print("Please set OPENAI_API_KEY environment variable or edit this script.")
-    print("\nExample (PowerShell):")
-    print('$env:OPENAI_API_KEY="sk-your-key-here"')
-    exit(1)
+from translation_backends import BACKENDS, Router
+from translation_gpt import format_usage, get_client, set_lesson_context, usage
 
-# System prompts for translation
-SYSTEM_PROMPT_EN = """You are a professional translator specializing in pharmaceutical and GMP (Good Manufacturing Practice) documentation. 
-Translate the following Slovenian text to English, maintaining:
-- Technical terminology accuracy (HEPA, ISO, GMP, HVAC, etc.)
-- Formal, professional tone
-- Markdown formatting
-- Bullet points and numbered lists
-- All technical specifications and numbers exactly as written
+# Texts longer than CHUNK_THRESHOLD are sent in paragraph chunks of ~CHUNK_SIZE characters
+CHUNK_THRESHOLD = 8000
+CHUNK_SIZE = 7000
 
-Do NOT translate technical acronyms like HEPA, ISO, GMP, HVAC, ACH, CFU, WFI, RABS, etc.
-Translate "DPP" as "GMP" and "Dodatek 1" as "Annex 1"."""
+# Fixed pauses (seconds) between requests to stay under rate limits
+CALL_PAUSE = 0.5
+CHUNK_PAUSE = 1
+LESSON_PAUSE = 2
+FILE_PAUSE = 5
 
-SYSTEM_PROMPT_HR = """You are a professional translator specializing in pharmaceutical and GMP (Good Manufacturing Practice) documentation.
-Translate the following Slovenian text to Croatian, maintaining:
-- Technical terminology accuracy (HEPA, ISO, GMP, HVAC, etc.)
-- Formal, professional tone
-- Markdown formatting
-- Bullet points and numbered lists
-- All technical specifications and numbers exactly as written
+# Translation tasks offered in the menu: choice -> [(input, output, language)]
+TASKS = {
+    '1': [('annex1-sl.json', 'annex1-en.json', 'en')],
+    '2': [('annex1-advanced-sl.json', 'annex1-advanced-en.json', 'en')],
+    '3': [('annex1-sl.json', 'annex1-hr.json', 'hr')],
+    '4': [('annex1-advanced-sl.json', 'annex1-advanced-hr.json', 'hr')],
+    '5': [
+        ('annex1-sl.json', 'annex1-en.json', 'en'),
+        ('annex1-advanced-sl.json', 'annex1-advanced-en.json', 'en')
+    ],
+    '6': [
+        ('annex1-sl.json', 'annex1-hr.json', 'hr'),
+        ('annex1-advanced-sl.json', 'annex1-advanced-hr.json', 'hr')
+    ],
+    '7': [
+        ('annex1-sl.json', 'annex1-en.json', 'en'),
+        ('annex1-advanced-sl.json', 'annex1-advanced-en.json', 'en'),
+        ('annex1-sl.json', 'annex1-hr.json', 'hr'),
+        ('annex1-advanced-sl.json', 'annex1-advanced-hr.json', 'hr')
+    ],
+}
 
-Do NOT translate technical acronyms. Keep HEPA, ISO, GMP, HVAC, ACH, CFU, WFI, RABS, etc. as-is.
-Translate "DPP" as "GMP" and "Dodatek 1" as "Prilog 1"."""
+# Decides which backend translates each segment; by default everything goes to GPT
+router = Router(fast='openai', quality='openai')
 
-def translate_with_gpt(text, target_lang='en', max_retries=3):
+def translate_segment(text, target_lang, kind):
     """
-    Translate text using GPT-4
+    Translate one segment with the backend the router picks for its size and kind
     """
-    if not text or len(text.strip()) == 0:
-        return text
+    return router.translate(text, target_lang, kind)
+
+def split_into_chunks(text):
+    """
+    Split a long text by paragraphs into chunks that fit one request
+    """
+    if len(text) <= CHUNK_THRESHOLD:
+        return [text]
+    
+    chunks = []
+    current_chunk = []
+    current_length = 0
+    
+    for para in text.split('\n\n'):
+        if current_length + len(para) > CHUNK_SIZE and current_chunk:
+            chunks.append('\n\n'.join(current_chunk))
+            current_chunk = [para]
+            current_length = len(para)
+        else:
+            current_chunk.append(para)
+            current_length += len(para)
     
-    system_prompt = SYSTEM_PROMPT_EN if target_lang == 'en' else SYSTEM_PROMPT_HR
+    if current_chunk:
+        chunks.append('\n\n'.join(current_chunk))
     
-    for attempt in range(max_retries):
+    return chunks
+
+def format_options(options):
+    """
+    Number quiz options so they can be translated in one request
+    """
+    return "\n".join([f"{i+1}. {opt}" for i, opt in enumerate(options)])
+
+def parse_options(translated_options):
+    """
+    Split a translated numbered option list back into options
+    """
+    return [line.split('. ', 1)[1] if '. ' in line else line
+            for line in translated_options.split('\n') if line.strip()]
+
+def translate_options(options, target_lang):
+    """
+    Translate quiz options in one request. If the translation comes back with a
+    different number of options (lines merged or split), retry on the quality
+    backend and finally keep the source options, so correctAnswerIndex stays valid.
+    """
+    text = format_options(options)
+    translated = parse_options(translate_segment(text, target_lang, 'options'))
+    if len(translated) != len(options) and router.pick(text, 'options') != router.quality:
+        print(f"        ⚠️ Got {len(translated)} of {len(options)} options, retrying with {router.quality}...")
+        translated = parse_options(router.translate(text, target_lang, 'options', backend=router.quality))
+    if len(translated) != len(options):
+        print(f"        ⚠️ Got {len(translated)} of {len(options)} options, keeping the source options")
+        return list(options)
+    return translated
+
+def load_progress(output_file):
+    """
+    Load already translated lessons from a previous, interrupted run
+    """
+    if output_file.exists():
         try:
-            response = client.chat.completions.create(
-                model="gpt-4o-mini",  # Using mini for cost efficiency, can change to gpt-4o for better quality
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": f"Translate this text:\n\n{text}"}
-                ],
-                temperature=0.3,  # Lower temperature for more consistent translations
-                max_tokens=4000
-            )
-            
-            translated = response.choices[0].message.content
-            return translated
-            
-        except Exception as e:
-            print(f"      Attempt {attempt + 1} failed: {e}")
-            if attempt < max_retries - 1:
-                time.sleep(2 ** attempt)  # Exponential backoff
-            else:
-                print(f"      Failed after {max_retries} attempts, returning original text")
-                return text
-    
-    return text
+            with open(output_file, 'r', encoding='utf-8') as f:
+                existing = json.load(f)
+                if existing:
+                    return existing
+        except:
+            pass
+    return []
 
 def translate_quiz_question(question, target_lang='en'):
     """
@@ -87,28 +131,25 @@ def translate_quiz_question(question, target_lang='en'):
     try:
         # Translate question
         print(f"        - Question...")
-        translated['question'] = translate_with_gpt(question['question'], target_lang)
-        time.sleep(0.5)
+        translated['question'] = translate_segment(question['question'], target_lang, 'question')
+        time.sleep(CALL_PAUSE)
         
         # Translate options (all at once to maintain consistency)
         print(f"        - Options...")
-        options_text = "\n".join([f"{i+1}. {opt}" for i, opt in enumerate(question['options'])])
-        translated_options = translate_with_gpt(options_text, target_lang)
-        translated['options'] = [line.split('. ', 1)[1] if '. ' in line else line 
-                                 for line in translated_options.split('\n') if line.strip()]
-        time.sleep(0.5)
+        translated['options'] = translate_options(question['options'], target_lang)
+        time.sleep(CALL_PAUSE)
         
         # Translate explanation
         if question.get('explanation'):
             print(f"        - Explanation...")
-            translated['explanation'] = translate_with_gpt(question['explanation'], target_lang)
-            time.sleep(0.5)
+            translated['explanation'] = translate_segment(question['explanation'], target_lang, 'explanation')
+            time.sleep(CALL_PAUSE)
         
         # Translate hint
         if question.get('hint'):
             print(f"        - Hint...")
-            translated['hint'] = translate_with_gpt(question['hint'], target_lang)
-            time.sleep(0.5)
+            translated['hint'] = translate_segment(question['hint'], target_lang, 'hint')
+            time.sleep(CALL_PAUSE)
         
     except Exception as e:
         print(f"        Error: {e}")
@@ -124,11 +165,13 @@ def translate_lesson(lesson, target_lang='en', lesson_num=1, total=1):
     print(f"{'='*60}")
     
     translated = lesson.copy()
+    set_lesson_context(lesson, target_lang)
+    before = dict(usage)
     
     # Translate title
     print("  ✓ Title...")
-    translated['title'] = translate_with_gpt(lesson['title'], target_lang)
-    time.sleep(0.5)
+    translated['title'] = translate_segment(lesson['title'], target_lang, 'title')
+    time.sleep(CALL_PAUSE)
     
     # Translate slug (keep it URL-friendly)
     # Don't translate slug - keep it same for routing
@@ -136,8 +179,8 @@ def translate_lesson(lesson, target_lang='en', lesson_num=1, total=1):
     # Translate annexReference
     if lesson.get('annexReference'):
         print("  ✓ Annex Reference...")
-        translated['annexReference'] = translate_with_gpt(lesson['annexReference'], target_lang)
-        time.sleep(0.5)
+        translated['annexReference'] = translate_segment(lesson['annexReference'], target_lang, 'annexReference')
+        time.sleep(CALL_PAUSE)
     
     # Translate main content fields
     content_fields = [
@@ -150,37 +193,15 @@ def translate_lesson(lesson, target_lang='en', lesson_num=1, total=1):
         if lesson.get(field):
             print(f"  ✓ {display_name}...")
             # Split very long texts into chunks
-            text = lesson[field]
-            if len(text) > 8000:
-                # Split by double newlines (paragraphs)
-                paragraphs = text.split('\n\n')
-                translated_paragraphs = []
-                
-                current_chunk = []
-                current_length = 0
-                
-                for para in paragraphs:
-                    if current_length + len(para) > 7000 and current_chunk:
-                        chunk_text = '\n\n'.join(current_chunk)
-                        translated_chunk = translate_with_gpt(chunk_text, target_lang)
-                        translated_paragraphs.append(translated_chunk)
-                        time.sleep(1)
-                        current_chunk = [para]
-                        current_length = len(para)
-                    else:
-                        current_chunk.append(para)
-                        current_length += len(para)
-                
-                if current_chunk:
-                    chunk_text = '\n\n'.join(current_chunk)
-                    translated_chunk = translate_with_gpt(chunk_text, target_lang)
-                    translated_paragraphs.append(translated_chunk)
-                
-                translated[field] = '\n\n'.join(translated_paragraphs)
-            else:
-                translated[field] = translate_with_gpt(text, target_lang)
+            chunks = split_into_chunks(lesson[field])
+            translated_chunks = []
+            for j, chunk in enumerate(chunks):
+                translated_chunks.append(translate_segment(chunk, target_lang, 'content'))
+                if j < len(chunks) - 1:
+                    time.sleep(CHUNK_PAUSE)
+            translated[field] = '\n\n'.join(translated_chunks)
             
-            time.sleep(0.5)
+            time.sleep(CALL_PAUSE)
     
     # Translate quiz questions
     if lesson.get('quizQuestions'):
@@ -193,7 +214,11 @@ def translate_lesson(lesson, target_lang='en', lesson_num=1, total=1):
             translated_q = translate_quiz_question(q, target_lang)
             translated['quizQuestions'].append(translated_q)
     
+    set_lesson_context(None, target_lang)
+    lesson_usage = {key: usage[key] - before[key] for key in usage}
     print(f"  ✅ Lesson {lesson['id']} complete!")
+    if lesson_usage['requests']:
+        print(f"     {format_usage(lesson_usage)}")
     return translated
 
 def translate_file(input_file, output_file, target_lang='en'):
@@ -211,18 +236,11 @@ def translate_file(input_file, output_file, target_lang='en'):
         lessons = json.load(f)
     
     total_lessons = len(lessons)
-    translated_lessons = []
     
     # Load existing progress if any
-    if output_file.exists():
-        try:
-            with open(output_file, 'r', encoding='utf-8') as f:
-                existing = json.load(f)
-                if existing:
-                    translated_lessons = existing
-                    print(f"ℹ Resuming from lesson {len(existing) + 1}")
-        except:
-            pass
+    translated_lessons = load_progress(output_file)
+    if translated_lessons:
+        print(f"ℹ Resuming from lesson {len(translated_lessons) + 1}")
     
     start_from = len(translated_lessons)
     
@@ -238,7 +256,7 @@ def translate_file(input_file, output_file, target_lang='en'):
         
         # Longer pause between lessons to avoid rate limits
         if i < len(lessons) - 1:
-            time.sleep(2)
+            time.sleep(LESSON_PAUSE)
     
     print(f"\n{'='*70}")
     print(f"✅ COMPLETE! Translated {len(translated_lessons)} lessons")
@@ -246,11 +264,26 @@ def translate_file(input_file, output_file, target_lang='en'):
     print(f"{'='*70}\n")
 
 def main():
+    global router
     base_path = Path(__file__).parent
     
+    parser = argparse.ArgumentParser(description="Translate lesson files with OpenAI GPT")
+    parser.add_argument('--plan', action='store_true', help="estimate requests, tokens, time and cost only")
+    parser.add_argument('--route', action='store_true',
+                        help="send short segments (titles, options, hints) to the cheapest available backend")
+    parser.add_argument('--backend', choices=sorted(BACKENDS), help="translate everything with one backend")
+    args = parser.parse_args()
+    plan_only = args.plan
+    
+    if args.backend:
+        router = Router(fast=args.backend, quality=args.backend)
+    elif args.route:
+        router = Router(quality='openai')
+    
     print("\n" + "="*70)
     print("HVAC ASSISTANT - LESSON TRANSLATION TOOL")
     print("Using OpenAI GPT-4o-mini for pharmaceutical content translation")
+    print(f"Routing: {router.describe()}")
     print("="*70 + "\n")
     
     # Ask user what to translate
@@ -265,41 +298,29 @@ def main():
     
     choice = input("\nEnter choice (1-7): ").strip()
     
-    tasks = []
-    
-    if choice == '1':
-        tasks = [('annex1-sl.json', 'annex1-en.json', 'en')]
-    elif choice == '2':
-        tasks = [('annex1-advanced-sl.json', 'annex1-advanced-en.json', 'en')]
-    elif choice == '3':
-        tasks = [('annex1-sl.json', 'annex1-hr.json', 'hr')]
-    elif choice == '4':
-        tasks = [('annex1-advanced-sl.json', 'annex1-advanced-hr.json', 'hr')]
-    elif choice == '5':
-        tasks = [
-            ('annex1-sl.json', 'annex1-en.json', 'en'),
-            ('annex1-advanced-sl.json', 'annex1-advanced-en.json', 'en')
-        ]
-    elif choice == '6':
-        tasks = [
-            ('annex1-sl.json', 'annex1-hr.json', 'hr'),
-            ('annex1-advanced-sl.json', 'annex1-advanced-hr.json', 'hr')
-        ]
-    elif choice == '7':
-        tasks = [
-            ('annex1-sl.json', 'annex1-en.json', 'en'),
-            ('annex1-advanced-sl.json', 'annex1-advanced-en.json', 'en'),
-            ('annex1-sl.json', 'annex1-hr.json', 'hr'),
-            ('annex1-advanced-sl.json', 'annex1-advanced-hr.json', 'hr')
-        ]
-    else:
+    if choice not in TASKS:
         print("Invalid choice!")
         return
     
+    tasks = TASKS[choice]
+    
+    if plan_only:
+        # Dry run: estimate requests, tokens, time and cost without calling the API
+        from translation_plan import plan_tasks, print_plan
+        print_plan(plan_tasks(tasks, base_path, backend='openai', router=router if args.route else None))
+        return
+    
     print(f"\n{'='*70}")
     print(f"Will translate {len(tasks)} file(s)")
     print(f"{'='*70}\n")
     
+    if 'openai' in (router.fast, router.quality):
+        try:
+            get_client()
+        except RuntimeError as e:
+            print(f"ERROR: {e}")
+            return
+    
     input("Press Enter to start translation...")
     
     start_time = time.time()
@@ -316,8 +337,8 @@ def main():
         )
         
         if i < len(tasks):
-            print("\n⏸ Waiting 5 seconds before next file...")
-            time.sleep(5)
+            print(f"\n⏸ Waiting {FILE_PAUSE} seconds before next file...")
+            time.sleep(FILE_PAUSE)
     
     elapsed = time.time() - start_time
     minutes = int(elapsed // 60)
@@ -326,6 +347,9 @@ def main():
     print("\n" + "="*70)
     print("🎉 ALL TRANSLATIONS COMPLETE! 🎉")
     print(f"   Total time: {minutes}m {seconds}s")
+    print(f"   Requests per backend: {router.counts}")
+    if usage['requests']:
+        print(f"   {format_usage()}")
     print("="*70 + "\n")
 
 if __name__ == '__main__':
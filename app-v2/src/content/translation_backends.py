@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Registry of translation backends and size/type-based routing between them
+Backends are only imported when a segment is first sent to them, so tools that
+never translate (or run offline) don't pay for openai/deep_translator imports.
+
+Short segments (titles, options, hints, anything under SHORT_TEXT_LIMIT) go to the
+cheapest/fastest available backend; long Markdown goes to the high-quality one.
+"""
+
+import importlib.util
+import os
+
+# Segment kinds that are always short and low-risk to translate with the fast backend
+SHORT_KINDS = {'title', 'annexReference', 'options', 'hint'}
+
+# Any segment shorter than this (characters) counts as short
+SHORT_TEXT_LIMIT = 200
+
+BACKENDS = {}
+
+def register(name):
+    """
+    Class decorator adding a backend to the registry under name
+    """
+    def decorator(cls):
+        cls.name = name
+        BACKENDS[name] = cls
+        return cls
+    return decorator
+
+@register('openai')
+class OpenAIBackend:
+    """GPT via translation_gpt.py - best terminology, paid per token"""
+    quality = 'high'
+    cost_per_1k_chars = 0.0001  # gpt-4o-mini, input + output
+    latency = 1.5               # seconds per request
+
+    def available(self):
+        return bool(os.environ.get('OPENAI_API_KEY')) and importlib.util.find_spec('openai') is not None
+
+    def translate(self, text, target_lang, raise_on_failure=False):
+        from translation_gpt import translate_with_gpt
+        return translate_with_gpt(text, target_lang, raise_on_failure=raise_on_failure)
+
+@register('google')
+class GoogleBackend:
+    """Google Translate via deep-translator (translation_google.py) - free, fast, weaker on GMP terms.
+    Sent without translate_lessons.py's fixed sleeps; the caller paces requests."""
+    quality = 'basic'
+    cost_per_1k_chars = 0.0
+    latency = 0.4               # one HTTP round trip, no built-in pause
+
+    def available(self):
+        return importlib.util.find_spec('deep_translator') is not None
+
+    def translate(self, text, target_lang, raise_on_failure=False):
+        from translation_google import translate_text
+        return translate_text(text, target_lang, raise_on_failure=raise_on_failure, pace=False)
+
+@register('offline')
+class OfflineBackend:
+    """Returns the source text unchanged - for dry runs and tests without network"""
+    quality = 'none'
+    cost_per_1k_chars = 0.0
+    latency = 0.0
+    explicit_only = True  # never picked automatically
+
+    def available(self):
+        return True
+
+    def translate(self, text, target_lang, raise_on_failure=False):
+        return text
+
+_instances = {}
+
+def get_backend(name):
+    """
+    Backend instance by name (created once)
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown translation backend: {name} (known: {', '.join(BACKENDS)})")
+    if name not in _instances:
+        _instances[name] = BACKENDS[name]()
+    return _instances[name]
+
+def _cheapest(candidates):
+    usable = [b for b in candidates if not getattr(b, 'explicit_only', False) and b.available()]
+    if not usable:
+        return None
+    return min(usable, key=lambda b: (b.cost_per_1k_chars, b.latency)).name
+
+class Router:
+    """
+    Picks a backend per segment. fast/quality may name a backend explicitly;
+    left as None they are chosen from the available backends by cost and latency.
+    """
+
+    def __init__(self, fast=None, quality=None):
+        backends = [get_backend(name) for name in BACKENDS]
+        self.quality = quality or _cheapest([b for b in backends if b.quality == 'high']) or 'openai'
+        self.fast = fast or _cheapest(backends) or self.quality
+        self.counts = {}
+
+    def is_short(self, text, kind):
+        return kind in SHORT_KINDS or len(text) < SHORT_TEXT_LIMIT
+
+    def pick(self, text, kind):
+        return self.fast if self.is_short(text, kind) else self.quality
+
+    def translate(self, text, target_lang, kind='content', backend=None, raise_on_failure=False):
+        """
+        Translate with the picked backend, or with backend if given. By default a
+        failed segment comes back untranslated; raise_on_failure raises instead.
+        """
+        if not text or len(text.strip()) == 0:
+            return text
+        name = backend or self.pick(text, kind)
+        self.counts[name] = self.counts.get(name, 0) + 1
+        return get_backend(name).translate(text, target_lang, raise_on_failure=raise_on_failure)
+
+    def describe(self):
+        return f"short segments → {self.fast}, long segments → {self.quality}"
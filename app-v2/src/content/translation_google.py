@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Google Translate (deep-translator) translation of one text segment
+Shared by translate_lessons.py and the 'google' backend in translation_backends.py,
+so the backend never imports a script module.
+"""
+
+import time
+
+# Paragraphs longer than CHUNK_SIZE are split by sentences into chunks
+CHUNK_SIZE = 3000
+
+# Fixed pauses (seconds) to avoid Google Translate rate limits
+PARAGRAPH_PAUSE = 1
+CHUNK_PAUSE = 1.5
+ERROR_PAUSE = 3
+
+def split_text(text, chunk_size=CHUNK_SIZE):
+    """
+    Split text into the pieces sent to Google Translate.
+    Returns (piece, pause) pairs; empty paragraphs have pause 0 and are not sent.
+    """
+    pieces = []
+    
+    # Split by paragraphs first
+    for para in text.split('\n\n'):
+        if len(para.strip()) == 0:
+            pieces.append((para, 0))
+            continue
+            
+        # If paragraph is too long, split by sentences
+        if len(para) > chunk_size:
+            sentences = para.split('. ')
+            current_chunk = []
+            current_length = 0
+            
+            for sentence in sentences:
+                if current_length + len(sentence) > chunk_size and current_chunk:
+                    pieces.append(('. '.join(current_chunk) + '.', CHUNK_PAUSE))
+                    current_chunk = [sentence]
+                    current_length = len(sentence)
+                else:
+                    current_chunk.append(sentence)
+                    current_length += len(sentence)
+            
+            if current_chunk:
+                pieces.append(('. '.join(current_chunk), CHUNK_PAUSE))
+        else:
+            # Paragraph is short enough, translate directly
+            pieces.append((para, PARAGRAPH_PAUSE))
+    
+    return pieces
+
+def translate_text(text, target_lang='en', chunk_size=CHUNK_SIZE, raise_on_failure=False, pace=True):
+    """
+    Translate text in chunks to avoid API limits; a chunk that fails keeps the
+    original text, or raises if raise_on_failure. pace=False skips the fixed
+    pauses for callers that space their own requests (the 'google' backend).
+    """
+    if not text or len(text.strip()) == 0:
+        return text
+    
+    from deep_translator import GoogleTranslator
+    
+    translated_paragraphs = []
+    
+    for piece, pause in split_text(text, chunk_size):
+        if pause == 0:
+            translated_paragraphs.append(piece)
+            continue
+        try:
+            translator = GoogleTranslator(source='sl', target=target_lang)
+            translated_paragraphs.append(translator.translate(piece))
+            if pace:
+                time.sleep(pause)
+        except Exception as e:
+            if raise_on_failure:
+                raise RuntimeError(f"Google translation failed: {e}") from e
+            print(f"      Warning: {e}, using original text")
+            translated_paragraphs.append(piece)
+            if pace:
+                time.sleep(ERROR_PAUSE)  # Even longer delay after error
+    
+    return '\n\n'.join(translated_paragraphs)
@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+OpenAI GPT translation of one text segment
+Holds the client, prompts, glossary, the shared per-lesson prompt prefix and the
+token usage totals. Kept out of translate_with_openai.py so that running that
+script and importing it from translation_backends/translation_queue share one copy
+of this state.
+"""
+
+import os
+import time
+
+MODEL = "gpt-4o-mini"  # Using mini for cost efficiency, can change to gpt-4o for better quality
+MAX_TOKENS = 4000
+
+# Lesson context, sent after the language-stable prefix (instructions + glossary):
+#   summary - title, Annex 1 reference and first paragraph (default)
+#   full    - title, reference and up to CONTEXT_CHARS of the explanation
+# Set GPT_LESSON_CONTEXT=full in the environment to use the full excerpt.
+LESSON_CONTEXT = os.environ.get('GPT_LESSON_CONTEXT', 'summary')
+CONTEXT_CHARS = 3000
+
+_client = None
+
+def get_client():
+    """
+    Create the OpenAI client on first use, so --plan works without a key.
+    Raises RuntimeError if the openai package or the API key is missing.
+    """
+    global _client
+    if _client is None:
+        try:
+            from openai import OpenAI
+            _client = OpenAI()  # Uses OPENAI_API_KEY from environment
+        except Exception as e:
+            raise RuntimeError(
+                "OpenAI API key not found!\n"
+                "Please set OPENAI_API_KEY environment variable or edit this script.\n"
+                "\nExample (PowerShell):\n"
+                '$env:OPENAI_API_KEY="sk-your-key-here"') from e
+    return _client
+
+# System prompts for translation
+SYSTEM_PROMPT_EN = """You are a professional translator specializing in pharmaceutical and GMP (Good Manufacturing Practice) documentation. 
+Translate the following Slovenian text to English, maintaining:
+- Technical terminology accuracy (HEPA, ISO, GMP, HVAC, etc.)
+- Formal, professional tone
+- Markdown formatting
+- Bullet points and numbered lists
+- All technical specifications and numbers exactly as written
+
+Do NOT translate technical acronyms like HEPA, ISO, GMP, HVAC, ACH, CFU, WFI, RABS, etc.
+Translate "DPP" as "GMP" and "Dodatek 1" as "Annex 1"."""
+
+SYSTEM_PROMPT_HR = """You are a professional translator specializing in pharmaceutical and GMP (Good Manufacturing Practice) documentation.
+Translate the following Slovenian text to Croatian, maintaining:
+- Technical terminology accuracy (HEPA, ISO, GMP, HVAC, etc.)
+- Formal, professional tone
+- Markdown formatting
+- Bullet points and numbered lists
+- All technical specifications and numbers exactly as written
+
+Do NOT translate technical acronyms. Keep HEPA, ISO, GMP, HVAC, ACH, CFU, WFI, RABS, etc. as-is.
+Translate "DPP" as "GMP" and "Dodatek 1" as "Prilog 1"."""
+
+# Output format, shared by both languages
+OUTPUT_RULES = """Output rules:
+- Return only the translation, without notes, explanations or quotation marks.
+- Keep every line break, heading marker, bullet and list number exactly where it is.
+- Numbered option lists ("1. ...", "2. ...") must come back with the same number of lines,
+  one option per line, in the same order; never merge or split options.
+- Keep numbers, units (µm, Pa, m/s, °C, %RH, CFU/m³) and limit values unchanged."""
+
+# Fixed term translations, sent with every request so all segments use the same wording.
+# With the instructions they form the stable prefix, which must stay over OpenAI's
+# 1024-token caching minimum (tests/test_translate_with_openai.py checks it).
+GLOSSARY = {
+    'en': [
+        ('Dodatek 1', 'Annex 1'),
+        ('dobra proizvodna praksa (DPP)', 'Good Manufacturing Practice (GMP)'),
+        ('strategija obvladovanja kontaminacije (CCS)', 'contamination control strategy (CCS)'),
+        ('čisti prostor', 'cleanroom'),
+        ('razred A / B / C / D', 'Grade A / B / C / D'),
+        ('mirovanje', 'at rest'),
+        ('obratovanje', 'in operation'),
+        ('aseptična obdelava', 'aseptic processing'),
+        ('simulacija aseptičnega postopka', 'aseptic process simulation (APS)'),
+        ('okoljski monitoring', 'environmental monitoring'),
+        ('opozorilna meja', 'alert limit'),
+        ('akcijska meja', 'action limit'),
+        ('delci', 'particles'),
+        ('kolonijske enote (CFU)', 'colony forming units (CFU)'),
+        ('enosmerni tok zraka', 'unidirectional airflow'),
+        ('tlačna razlika', 'pressure differential'),
+        ('izmenjave zraka na uro (ACH)', 'air changes per hour (ACH)'),
+        ('preskus celovitosti filtra', 'filter integrity test'),
+        ('zračna zapora', 'airlock'),
+        ('preoblačenje', 'gowning'),
+        ('izolator', 'isolator'),
+        ('voda za injekcije (WFI)', 'water for injections (WFI)'),
+        ('kvalifikacija', 'qualification'),
+        ('validacija', 'validation'),
+        ('ocena tveganja', 'risk assessment'),
+        ('obvladovanje tveganja za kakovost (QRM)', 'quality risk management (QRM)'),
+        ('odstopanje', 'deviation'),
+        ('korektivni in preventivni ukrepi (CAPA)', 'corrective and preventive actions (CAPA)'),
+        ('sterilizacija', 'sterilization'),
+        ('končna sterilizacija', 'terminal sterilization'),
+        ('sterilna filtracija', 'sterilizing filtration'),
+        ('depirogenizacija', 'depyrogenation'),
+        ('endotoksini', 'endotoxins'),
+        ('bioobremenitev', 'bioburden'),
+        ('zaprti sistem', 'closed system'),
+        ('sistem pregrad z omejenim dostopom (RABS)', 'restricted access barrier system (RABS)'),
+        ('aseptično polnjenje', 'aseptic filling'),
+        ('liofilizacija', 'lyophilization'),
+        ('celovitost zaprtja vsebnika', 'container closure integrity'),
+        ('vizualni pregled', 'visual inspection'),
+        ('čiščenje in razkuževanje', 'cleaning and disinfection'),
+        ('razkužilo', 'disinfectant'),
+        ('sporocidno sredstvo', 'sporicidal agent'),
+        ('dekontaminacija', 'decontamination'),
+        ('vodikov peroksid v parni fazi (VHP)', 'vaporized hydrogen peroxide (VHP)'),
+        ('vzorčenje zraka', 'air sampling'),
+        ('sedimentacijske plošče', 'settle plates'),
+        ('kontaktne plošče', 'contact plates'),
+        ('odtis rokavic', 'glove print'),
+        ('bris', 'swab'),
+        ('analiza trendov', 'trend analysis'),
+        ('hitrost zraka', 'air velocity'),
+        ('vizualizacija zračnega toka (dimni test)', 'airflow visualization (smoke study)'),
+        ('čas okrevanja', 'recovery time'),
+        ('prvi zrak', 'first air'),
+        ('kaskada tlakov', 'pressure cascade'),
+        ('klasifikacija čistih prostorov', 'cleanroom classification'),
+        ('rekvalifikacija', 'requalification'),
+        ('kvalifikacija namestitve (IQ)', 'installation qualification (IQ)'),
+        ('kvalifikacija delovanja (OQ)', 'operational qualification (OQ)'),
+        ('kvalifikacija zmogljivosti (PQ)', 'performance qualification (PQ)'),
+        ('standardni operativni postopek (SOP)', 'standard operating procedure (SOP)'),
+        ('serija', 'batch'),
+        ('sproščanje serije', 'batch release'),
+        ('kvalificirana oseba (QP)', 'Qualified Person (QP)'),
+        ('zagotavljanje kakovosti (QA)', 'quality assurance (QA)'),
+        ('kontrola kakovosti (QC)', 'quality control (QC)'),
+        ('farmacevtski sistem kakovosti (PQS)', 'pharmaceutical quality system (PQS)'),
+        ('preiskava', 'investigation'),
+        ('analiza temeljnega vzroka', 'root cause analysis'),
+        ('obvladovanje sprememb', 'change control'),
+        ('inherentne intervencije', 'inherent interventions'),
+        ('korektivne intervencije', 'corrective interventions'),
+        ('čista para', 'pure steam'),
+        ('prečiščena voda', 'purified water'),
+        ('osebje', 'personnel'),
+        ('usposabljanje', 'training'),
+        ('oblačila za čiste prostore', 'cleanroom garments'),
+    ],
+    'hr': [
+        ('Dodatek 1', 'Prilog 1'),
+        ('dobra proizvodna praksa (DPP)', 'dobra proizvođačka praksa (GMP)'),
+        ('strategija obvladovanja kontaminacije (CCS)', 'strategija kontrole kontaminacije (CCS)'),
+        ('čisti prostor', 'čisti prostor'),
+        ('razred A / B / C / D', 'razred A / B / C / D'),
+        ('mirovanje', 'u mirovanju'),
+        ('obratovanje', 'u radu'),
+        ('aseptična obdelava', 'aseptička obrada'),
+        ('simulacija aseptičnega postopka', 'simulacija aseptičkog procesa (APS)'),
+        ('okoljski monitoring', 'monitoring okoliša'),
+        ('opozorilna meja', 'granica upozorenja'),
+        ('akcijska meja', 'granica djelovanja'),
+        ('delci', 'čestice'),
+        ('kolonijske enote (CFU)', 'jedinice koje tvore kolonije (CFU)'),
+        ('enosmerni tok zraka', 'jednosmjerni protok zraka'),
+        ('tlačna razlika', 'razlika tlakova'),
+        ('izmenjave zraka na uro (ACH)', 'izmjene zraka na sat (ACH)'),
+        ('preskus celovitosti filtra', 'ispitivanje cjelovitosti filtra'),
+        ('zračna zapora', 'zračna komora'),
+        ('preoblačenje', 'presvlačenje'),
+        ('izolator', 'izolator'),
+        ('voda za injekcije (WFI)', 'voda za injekcije (WFI)'),
+        ('kvalifikacija', 'kvalifikacija'),
+        ('validacija', 'validacija'),
+        ('ocena tveganja', 'procjena rizika'),
+        ('obvladovanje tveganja za kakovost (QRM)', 'upravljanje rizikom za kvalitetu (QRM)'),
+        ('odstopanje', 'odstupanje'),
+        ('korektivni in preventivni ukrepi (CAPA)', 'korektivne i preventivne mjere (CAPA)'),
+        ('sterilizacija', 'sterilizacija'),
+        ('končna sterilizacija', 'terminalna sterilizacija'),
+        ('sterilna filtracija', 'sterilizirajuća filtracija'),
+        ('depirogenizacija', 'depirogenizacija'),
+        ('endotoksini', 'endotoksini'),
+        ('bioobremenitev', 'biološko opterećenje'),
+        ('zaprti sistem', 'zatvoreni sustav'),
+        ('sistem pregrad z omejenim dostopom (RABS)', 'sustav barijera s ograničenim pristupom (RABS)'),
+        ('aseptično polnjenje', 'aseptičko punjenje'),
+        ('liofilizacija', 'liofilizacija'),
+        ('celovitost zaprtja vsebnika', 'cjelovitost zatvarača spremnika'),
+        ('vizualni pregled', 'vizualni pregled'),
+        ('čiščenje in razkuževanje', 'čišćenje i dezinfekcija'),
+        ('razkužilo', 'dezinficijens'),
+        ('sporocidno sredstvo', 'sporicidno sredstvo'),
+        ('dekontaminacija', 'dekontaminacija'),
+        ('vodikov peroksid v parni fazi (VHP)', 'vodikov peroksid u parnoj fazi (VHP)'),
+        ('vzorčenje zraka', 'uzorkovanje zraka'),
+        ('sedimentacijske plošče', 'taložne ploče'),
+        ('kontaktne plošče', 'kontaktne ploče'),
+        ('odtis rokavic', 'otisak rukavica'),
+        ('bris', 'bris'),
+        ('analiza trendov', 'analiza trendova'),
+        ('hitrost zraka', 'brzina zraka'),
+        ('vizualizacija zračnega toka (dimni test)', 'vizualizacija protoka zraka (test dimom)'),
+        ('čas okrevanja', 'vrijeme oporavka'),
+        ('prvi zrak', 'prvi zrak'),
+        ('kaskada tlakov', 'kaskada tlakova'),
+        ('klasifikacija čistih prostorov', 'klasifikacija čistih prostora'),
+        ('rekvalifikacija', 'rekvalifikacija'),
+        ('kvalifikacija namestitve (IQ)', 'kvalifikacija instalacije (IQ)'),
+        ('kvalifikacija delovanja (OQ)', 'operativna kvalifikacija (OQ)'),
+        ('kvalifikacija zmogljivosti (PQ)', 'kvalifikacija izvedbe (PQ)'),
+        ('standardni operativni postopek (SOP)', 'standardni operativni postupak (SOP)'),
+        ('serija', 'serija'),
+        ('sproščanje serije', 'puštanje serije u promet'),
+        ('kvalificirana oseba (QP)', 'kvalificirana osoba (QP)'),
+        ('zagotavljanje kakovosti (QA)', 'osiguranje kvalitete (QA)'),
+        ('kontrola kakovosti (QC)', 'kontrola kvalitete (QC)'),
+        ('farmacevtski sistem kakovosti (PQS)', 'farmaceutski sustav kvalitete (PQS)'),
+        ('preiskava', 'istraživanje'),
+        ('analiza temeljnega vzroka', 'analiza temeljnog uzroka'),
+        ('obvladovanje sprememb', 'upravljanje promjenama'),
+        ('inherentne intervencije', 'inherentne intervencije'),
+        ('korektivne intervencije', 'korektivne intervencije'),
+        ('čista para', 'čista para'),
+        ('prečiščena voda', 'pročišćena voda'),
+        ('osebje', 'osoblje'),
+        ('usposabljanje', 'obuka'),
+        ('oblačila za čiste prostore', 'odjeća za čiste prostore'),
+    ],
+}
+
+# System message for the lesson being translated (see set_lesson_context)
+_lesson_context = None
+
+# Token usage reported by the API, including how much of the prompt was served from cache
+usage = {'requests': 0, 'prompt_tokens': 0, 'cached_tokens': 0, 'completion_tokens': 0}
+
+def lesson_summary(lesson, context=None):
+    """
+    Title, Annex 1 reference and the first paragraph of the lesson, or with
+    context='full' the opening paragraphs up to CONTEXT_CHARS
+    """
+    limit = CONTEXT_CHARS if (context or LESSON_CONTEXT) == 'full' else 0
+    lines = [f"Lesson: {lesson['title']}"]
+    if lesson.get('annexReference'):
+        lines.append(f"Reference: {lesson['annexReference']}")
+    excerpt = ''
+    for para in (lesson.get('developmentAndExplanation') or '').split('\n\n'):
+        if excerpt and len(excerpt) + len(para) > limit:
+            break
+        excerpt = f"{excerpt}\n\n{para}" if excerpt else para[:max(limit, 500)]
+    if excerpt:
+        lines.append(f"\n{excerpt}")
+    return '\n'.join(lines)
+
+def stable_prefix(target_lang):
+    """
+    Instructions, output rules and the full glossary - identical for every request in one language
+    """
+    system_prompt = SYSTEM_PROMPT_EN if target_lang == 'en' else SYSTEM_PROMPT_HR
+    glossary = '\n'.join(f"- {sl} → {target}" for sl, target in GLOSSARY.get(target_lang, []))
+    return f"{system_prompt}\n\n{OUTPUT_RULES}\n\nGlossary (always use these translations):\n{glossary}"
+
+def build_system_prompt(target_lang, lesson=None, context=None):
+    """
+    System message: the language-stable prefix, then (optionally) the lesson context.
+    Every request of a run in one language starts with the same 1024+ tokens, so
+    OpenAI's prompt cache serves them after the first request; only the lesson
+    context and the segment (user message) are billed at the full rate.
+    """
+    parts = [stable_prefix(target_lang)]
+    if lesson is not None:
+        parts.append("Context: the lesson this text comes from (Slovenian source, do not translate it, "
+                     "use it only to keep terminology and meaning consistent):\n\n" + lesson_summary(lesson, context))
+    return '\n\n'.join(parts)
+
+def cache_key(target_lang):
+    """
+    prompt_cache_key shared by all requests with the same stable prefix
+    """
+    return f"translate-{target_lang}"
+
+def set_lesson_context(lesson, target_lang):
+    """
+    Send this lesson's context after the stable prefix in the following translate_with_gpt calls
+    """
+    global _lesson_context
+    if lesson is None:
+        _lesson_context = None
+    else:
+        _lesson_context = {
+            'lang': target_lang,
+            'system': build_system_prompt(target_lang, lesson),
+        }
+
+def record_usage(response_usage):
+    """
+    Add a response's token usage to the running totals
+    """
+    if response_usage is None:
+        return
+    details = getattr(response_usage, 'prompt_tokens_details', None)
+    usage['requests'] += 1
+    usage['prompt_tokens'] += response_usage.prompt_tokens or 0
+    usage['cached_tokens'] += (getattr(details, 'cached_tokens', 0) or 0) if details else 0
+    usage['completion_tokens'] += response_usage.completion_tokens or 0
+
+def format_usage(totals=None):
+    """
+    One-line summary of prompt tokens and the share served from the prompt cache
+    """
+    totals = totals or usage
+    ratio = totals['cached_tokens'] / totals['prompt_tokens'] if totals['prompt_tokens'] else 0
+    return (f"{totals['requests']} GPT requests, {totals['prompt_tokens']:,} prompt tokens "
+            f"({totals['cached_tokens']:,} cached, {ratio:.0%}), {totals['completion_tokens']:,} completion tokens")
+
+def translate_with_gpt(text, target_lang='en', max_retries=3, raise_on_failure=False):
+    """
+    Translate text using GPT-4; after max_retries failures return the original
+    text, or raise if raise_on_failure
+    """
+    if not text or len(text.strip()) == 0:
+        return text
+    
+    # Stable prefix for the language, then the current lesson's context; only the user message varies
+    context = _lesson_context if _lesson_context and _lesson_context['lang'] == target_lang else None
+    system_prompt = context['system'] if context else build_system_prompt(target_lang)
+    extra_body = {'prompt_cache_key': cache_key(target_lang)}
+    # A missing key or package is not worth retrying, let it reach the caller
+    client = get_client()
+    
+    for attempt in range(max_retries):
+        try:
+            response = client.chat.completions.create(
+                model=MODEL,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": f"Translate this text:\n\n{text}"}
+                ],
+                temperature=0.3,  # Lower temperature for more consistent translations
+                max_tokens=MAX_TOKENS,
+                extra_body=extra_body
+            )
+            record_usage(getattr(response, 'usage', None))
+            
+            translated = response.choices[0].message.content
+            return translated
+            
+        except Exception as e:
+            print(f"      Attempt {attempt + 1} failed: {e}")
+            if attempt < max_retries - 1:
+                time.sleep(2 ** attempt)  # Exponential backoff
+            elif raise_on_failure:
+                raise RuntimeError(f"GPT translation failed after {max_retries} attempts: {e}") from e
+            else:
+                print(f"      Failed after {max_retries} attempts, returning original text")
+                return text
+    
+    return text
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Dry-run planner for lesson translation
+Walks the source files exactly as translate_with_openai.py and translate_lessons.py
+would (same chunking, same per-question calls, same resume logic) and estimates
+requests, tokens, wall time and cost without calling any API
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+import translate_lessons
+import translate_with_openai
+import translation_google
+import translation_gpt
+from translation_backends import Router
+
+# Rough characters per token for Slovenian/Croatian/English text when tiktoken is not installed
+CHARS_PER_TOKEN = 3.6
+
+# Chat message framing overhead per request (system + user message)
+MESSAGE_OVERHEAD = 8
+
+# OpenAI caches prompt prefixes of at least 1024 tokens, in steps of 128 tokens
+CACHE_MIN_TOKENS = 1024
+CACHE_STEP_TOKENS = 128
+
+# Translated length relative to the Slovenian source, in tokens
+OUTPUT_RATIO = {'en': 0.9, 'hr': 1.05}
+
+# Per-backend models: price in USD per 1M tokens, latency model and default rate limits
+BACKENDS = {
+    'openai': {
+        'name': 'OpenAI (translate_with_openai.py)',
+        'models': {
+            'gpt-4o-mini': {'input_per_1m': 0.15, 'cached_input_per_1m': 0.075, 'output_per_1m': 0.60,
+                            'latency': 0.6, 'tokens_per_second': 80},
+            'gpt-4o': {'input_per_1m': 2.50, 'cached_input_per_1m': 1.25, 'output_per_1m': 10.00,
+                       'latency': 0.8, 'tokens_per_second': 60},
+        },
+        'rpm': 500,
+        'tpm': 200000,
+    },
+    'google': {
+        'name': 'Google Translate via deep-translator (translate_lessons.py)',
+        'models': {
+            'web': {'input_per_1m': 0.0, 'cached_input_per_1m': 0.0, 'output_per_1m': 0.0,
+                    'latency': 0.4, 'tokens_per_second': 2000},
+        },
+        'rpm': 60,
+        'tpm': None,
+    },
+}
+
+_encoder = None
+
+def estimate_tokens(text):
+    """
+    Count tokens with tiktoken if available, otherwise estimate from length
+    """
+    global _encoder
+    if _encoder is None:
+        try:
+            import tiktoken
+            _encoder = tiktoken.get_encoding('o200k_base')
+        except Exception:
+            _encoder = False
+    if _encoder:
+        return len(_encoder.encode(text))
+    return max(1, round(len(text) / CHARS_PER_TOKEN))
+
+def _new_stats():
+    return {'requests': 0, 'chars': 0, 'input_tokens': 0, 'cached_tokens': 0, 'output_tokens': 0,
+            'pause': 0.0, 'lessons': 0, 'routed': 0, 'routed_requests': 0, 'routed_seconds': 0.0}
+
+def cached_prefix_tokens(prefix_tokens):
+    """
+    Tokens of a shared prefix OpenAI can serve from its prompt cache
+    """
+    if prefix_tokens < CACHE_MIN_TOKENS:
+        return 0
+    return prefix_tokens - (prefix_tokens - CACHE_MIN_TOKENS) % CACHE_STEP_TOKENS
+
+def _add_request(stats, text, prompt_tokens, target_lang, cached_tokens=0):
+    output_tokens = round(estimate_tokens(text) * OUTPUT_RATIO.get(target_lang, 1.0))
+    stats['requests'] += 1
+    stats['chars'] += len(text)
+    stats['input_tokens'] += prompt_tokens
+    stats['cached_tokens'] += cached_tokens
+    stats['output_tokens'] += output_tokens
+
+def _add_routed(stats, text, backend):
+    """
+    Count a segment the router sends off GPT. Google requests mirror
+    translation_google.translate_text as the backend calls it: one request per
+    piece, without the script's fixed sleeps (the caller's pause is counted by the caller).
+    """
+    stats['routed'] += 1
+    if backend != 'google':
+        return
+    model = BACKENDS['google']['models']['web']
+    for piece, piece_pause in translation_google.split_text(text):
+        if piece_pause:
+            stats['routed_requests'] += 1
+            stats['routed_seconds'] += model['latency'] + estimate_tokens(piece) / model['tokens_per_second']
+
+def _plan_openai_lesson(lesson, target_lang, stats, router=None, warm=None):
+    """
+    Mirror translate_with_openai.translate_lesson; segments the router sends
+    elsewhere are planned with _add_routed. Every GPT request after the first one
+    in a language (warm holds the languages already sent) is assumed to hit the
+    prompt cache for the language-stable prefix.
+    """
+    t = translate_with_openai
+    warm = set() if warm is None else warm
+    system_tokens = estimate_tokens(translation_gpt.build_system_prompt(target_lang, lesson)) + MESSAGE_OVERHEAD
+    cacheable = cached_prefix_tokens(estimate_tokens(translation_gpt.stable_prefix(target_lang)))
+
+    def call(text, pause, kind):
+        # translate_with_gpt returns empty text without a request
+        if text and len(text.strip()) > 0 and router and router.pick(text, kind) != 'openai':
+            _add_routed(stats, text, router.pick(text, kind))
+        elif text and len(text.strip()) > 0:
+            user_content = f"Translate this text:\n\n{text}"
+            _add_request(stats, text, system_tokens + estimate_tokens(user_content), target_lang,
+                         cacheable if target_lang in warm else 0)
+            warm.add(target_lang)
+        stats['pause'] += pause
+
+    call(lesson['title'], t.CALL_PAUSE, 'title')
+    if lesson.get('annexReference'):
+        call(lesson['annexReference'], t.CALL_PAUSE, 'annexReference')
+
+    for field in ('developmentAndExplanation', 'practicalChallenges', 'improvementIdeas'):
+        if lesson.get(field):
+            chunks = t.split_into_chunks(lesson[field])
+            for j, chunk in enumerate(chunks):
+                call(chunk, t.CHUNK_PAUSE if j < len(chunks) - 1 else 0, 'content')
+            stats['pause'] += t.CALL_PAUSE
+
+    for q in lesson.get('quizQuestions') or []:
+        call(q['question'], t.CALL_PAUSE, 'question')
+        call(t.format_options(q['options']), t.CALL_PAUSE, 'options')
+        if q.get('explanation'):
+            call(q['explanation'], t.CALL_PAUSE, 'explanation')
+        if q.get('hint'):
+            call(q['hint'], t.CALL_PAUSE, 'hint')
+
+def _plan_google_lesson(lesson, target_lang, stats):
+    """
+    Mirror translate_lessons.translate_lesson
+    """
+    t = translate_lessons
+
+    def call(text, pause):
+        # translate_text sends one request per non-empty paragraph or sentence chunk
+        if text and len(text.strip()) > 0:
+            for piece, piece_pause in translation_google.split_text(text):
+                if piece_pause:
+                    _add_request(stats, piece, estimate_tokens(piece), target_lang)
+                    stats['pause'] += piece_pause
+        stats['pause'] += pause
+
+    call(lesson['title'], t.FIELD_PAUSE)
+    if lesson.get('annexReference'):
+        call(lesson['annexReference'], t.FIELD_PAUSE)
+
+    for field in ('developmentAndExplanation', 'practicalChallenges', 'improvementIdeas'):
+        if lesson.get(field):
+            call(lesson[field], t.CONTENT_PAUSE)
+
+    for q in lesson.get('quizQuestions') or []:
+        call(q['question'], t.FIELD_PAUSE)
+        for opt in q['options']:
+            call(opt, 0)
+        stats['pause'] += t.FIELD_PAUSE
+        if q.get('explanation'):
+            call(q['explanation'], t.FIELD_PAUSE)
+        if q.get('hint'):
+            call(q['hint'], t.FIELD_PAUSE)
+
+def plan_tasks(tasks, base_path, backend='openai', fresh=False, router=None):
+    """
+    Walk translation tasks [(input, output, language)] without calling any API.
+    Lessons already present in an output file are skipped like a resumed OpenAI run,
+    unless fresh=True. translate_lessons.py never resumes.
+    With a router, OpenAI figures only cover the segments it keeps on GPT.
+    """
+    base_path = Path(base_path)
+    plan = {'backend': backend, 'files': [], 'total': _new_stats(),
+            'routing': router.describe() if router else None}
+    warm = set()  # languages whose prompt prefix is already cached
+
+    for i, (input_name, output_name, lang) in enumerate(tasks):
+        with open(base_path / input_name, 'r', encoding='utf-8') as f:
+            lessons = json.load(f)
+
+        start_from = 0
+        if backend == 'openai' and not fresh:
+            start_from = len(translate_with_openai.load_progress(base_path / output_name))
+
+        stats = _new_stats()
+        for j, lesson in enumerate(lessons[start_from:], start=start_from):
+            if backend == 'openai':
+                _plan_openai_lesson(lesson, lang, stats, router, warm)
+                if j < len(lessons) - 1:
+                    stats['pause'] += translate_with_openai.LESSON_PAUSE
+            else:
+                _plan_google_lesson(lesson, lang, stats)
+            stats['lessons'] += 1
+
+        if backend == 'openai' and i < len(tasks) - 1:
+            stats['pause'] += translate_with_openai.FILE_PAUSE
+
+        plan['files'].append({
+            'input': input_name,
+            'output': output_name,
+            'lang': lang,
+            'skipped': start_from,
+            **stats,
+        })
+        for key in plan['total']:
+            plan['total'][key] += stats[key]
+
+    return plan
+
+def estimate_model(total, model, backend, concurrency=1, rpm=None, tpm=None):
+    """
+    Estimate cost and wall time of a plan's totals for one model
+    """
+    config = BACKENDS[backend]
+    rpm = rpm or config['rpm']
+    tpm = tpm or config['tpm']
+
+    # Routed segments run in the same loop, one request at a time
+    work = (total['requests'] * model['latency'] + total['output_tokens'] / model['tokens_per_second']
+            + total['routed_seconds'])
+    uncached = total['input_tokens'] - total['cached_tokens']
+    cost = (uncached * model['input_per_1m'] + total['cached_tokens'] * model['cached_input_per_1m']
+            + total['output_tokens'] * model['output_per_1m']) / 1_000_000
+
+    # OpenAI counts max_tokens against the TPM limit, not the actual completion length
+    limit_tokens = total['input_tokens']
+    if backend == 'openai':
+        limit_tokens += total['requests'] * translation_gpt.MAX_TOKENS
+
+    bounds = {
+        'workers': work / max(1, concurrency),
+        'rpm': total['requests'] / rpm * 60 if rpm else 0,
+        'tpm': limit_tokens / tpm * 60 if tpm else 0,
+        'google rpm': total['routed_requests'] / BACKENDS['google']['rpm'] * 60,
+    }
+    bottleneck = max(bounds, key=bounds.get)
+
+    return {
+        'cost': cost,
+        'scripted_seconds': work + total['pause'],
+        'projected_seconds': bounds[bottleneck],
+        'bottleneck': bottleneck,
+    }
+
+def _format_duration(seconds):
+    minutes = int(seconds // 60)
+    return f"{minutes}m {int(seconds % 60):02d}s"
+
+def print_plan(plan, concurrency=1, rpm=None, tpm=None):
+    """
+    Print a plan with per-model cost and time projections
+    """
+    config = BACKENDS[plan['backend']]
+    total = plan['total']
+
+    print("\n" + "="*70)
+    print(f"TRANSLATION PLAN (dry run) - {config['name']}")
+    print("="*70)
+
+    for f in plan['files']:
+        skipped = f" (skipping {f['skipped']} already translated)" if f['skipped'] else ""
+        print(f"\n📄 {f['input']} → {f['output']} [{f['lang'].upper()}]{skipped}")
+        print(f"   Lessons:       {f['lessons']}")
+        print(f"   Requests:      {f['requests']:,}")
+        print(f"   Characters:    {f['chars']:,}")
+        print(f"   Input tokens:  ~{f['input_tokens']:,}" + (f" (~{f['cached_tokens']:,} cached)" if f['cached_tokens'] else ""))
+        print(f"   Output tokens: ~{f['output_tokens']:,}")
+
+    print("\n" + "-"*70)
+    print(f"TOTAL: {total['requests']:,} requests, {total['lessons']} lessons, {total['chars']:,} characters")
+    print(f"       ~{total['input_tokens']:,} input tokens (~{total['cached_tokens']:,} from prompt cache), "
+          f"~{total['output_tokens']:,} output tokens")
+    print(f"       {_format_duration(total['pause'])} of fixed sleeps in the script")
+    if plan['routing']:
+        print(f"       Routing: {plan['routing']} ({total['routed']:,} segments routed off GPT, "
+              f"{total['routed_requests']:,} Google requests)")
+    print("-"*70)
+
+    print(f"\nProjection with {concurrency} worker(s), "
+          f"{rpm or config['rpm']} RPM, {tpm or config['tpm'] or 'no'} TPM limit:")
+    for model_name, model in config['models'].items():
+        estimate = estimate_model(total, model, plan['backend'], concurrency, rpm, tpm)
+        print(f"\n  {model_name}")
+        print(f"    Cost:                ${estimate['cost']:.2f}")
+        print(f"    As scripted (1 worker, fixed sleeps): {_format_duration(estimate['scripted_seconds'])}")
+        print(f"    Projected:           {_format_duration(estimate['projected_seconds'])} "
+              f"(limited by {estimate['bottleneck']})")
+
+    print("\n" + "="*70 + "\n")
+
+def main():
+    parser = argparse.ArgumentParser(description="Estimate a translation run without calling any API")
+    parser.add_argument('--choice', default='7', choices=sorted(translate_with_openai.TASKS),
+                        help="task as in translate_with_openai.py menu (default: 7, everything)")
+    parser.add_argument('--backend', default='all', choices=['openai', 'google', 'all'])
+    parser.add_argument('--concurrency', type=int, default=1, help="parallel workers to project for")
+    parser.add_argument('--rpm', type=int, help="requests per minute limit (default: per backend)")
+    parser.add_argument('--tpm', type=int, help="tokens per minute limit (default: per backend)")
+    parser.add_argument('--fresh', action='store_true', help="ignore progress already saved in output files")
+    parser.add_argument('--route', action='store_true',
+                        help="plan translate_with_openai.py --route (short segments to the cheapest backend)")
+    args = parser.parse_args()
+
+    base_path = Path(__file__).parent
+    tasks = translate_with_openai.TASKS[args.choice]
+    backends = ['openai', 'google'] if args.backend == 'all' else [args.backend]
+
+    for backend in backends:
+        router = Router(quality='openai') if args.route and backend == 'openai' else None
+        plan = plan_tasks(tasks, base_path, backend=backend, fresh=args.fresh, router=router)
+        print_plan(plan, args.concurrency, args.rpm, args.tpm)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Persistent work queue for distributed lesson translation
+Every translatable segment (title, content chunk, question, options, ...) is one job
+in a SQLite file. Any number of workers, in one or more processes or on machines
+sharing the file, lease jobs, translate them and commit the result. A lease is kept
+alive by a heartbeat; if a worker dies its lease expires and the job is handed out
+again. The output JSON files are assembled from the committed results.
+
+The SQLite file must be on a filesystem with working file locks (local disk or SMB;
+NFS locking is often unreliable).
+
+Usage:
+    python translation_queue.py enqueue --choice 7
+    python translation_queue.py work --route        # start as many as you like
+    python translation_queue.py status
+    python translation_queue.py assemble
+"""
+
+import argparse
+import copy
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+
+import translate_with_openai
+import translation_gpt
+from translate_with_openai import TASKS, format_options, parse_options, split_into_chunks
+from translation_backends import BACKENDS, Router
+
+DEFAULT_QUEUE = Path(__file__).parent / 'translation_queue.sqlite'
+
+LEASE_SECONDS = 120
+HEARTBEAT_SECONDS = 30
+POLL_SECONDS = 5
+MAX_ATTEMPTS = 5
+
+# A released job waits RETRY_SECONDS * 2 ** (attempts - 1) before it is leased again
+# (5, 10, 20, 40 s), so a short outage or a 429 does not use up all attempts at once
+RETRY_SECONDS = 5
+
+CONTENT_FIELDS = ['developmentAndExplanation', 'practicalChallenges', 'improvementIdeas']
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    output TEXT NOT NULL,
+    lang TEXT NOT NULL,
+    lesson INTEGER NOT NULL,
+    field TEXT NOT NULL,
+    part INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    text TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    lease_owner TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    error TEXT,
+    updated_at REAL,
+    UNIQUE (output, lesson, field, part)
+);
+CREATE INDEX IF NOT EXISTS jobs_status_idx ON jobs (status, lease_expires);
+"""
+
+def connect(queue_path):
+    conn = sqlite3.connect(queue_path, timeout=30, isolation_level=None)
+    conn.execute("PRAGMA busy_timeout = 30000")
+    conn.executescript(SCHEMA)
+    return conn
+
+def lesson_segments(lesson):
+    """
+    Yield (field, part, kind, text) for every request translate_with_openai.translate_lesson makes
+    """
+    yield 'title', 0, 'title', lesson['title']
+    if lesson.get('annexReference'):
+        yield 'annexReference', 0, 'annexReference', lesson['annexReference']
+
+    for field in CONTENT_FIELDS:
+        if lesson.get(field):
+            for part, chunk in enumerate(split_into_chunks(lesson[field])):
+                yield field, part, 'content', chunk
+
+    for i, q in enumerate(lesson.get('quizQuestions') or []):
+        yield f'quizQuestions.{i}.question', 0, 'question', q['question']
+        yield f'quizQuestions.{i}.options', 0, 'options', format_options(q['options'])
+        if q.get('explanation'):
+            yield f'quizQuestions.{i}.explanation', 0, 'explanation', q['explanation']
+        if q.get('hint'):
+            yield f'quizQuestions.{i}.hint', 0, 'hint', q['hint']
+
+def enqueue(conn, tasks, base_path):
+    """
+    Add a job per segment; jobs whose source text changed and failed jobs are reset,
+    finished ones are kept, jobs for segments removed from the source are dropped
+    """
+    now = time.time()
+    rows = []
+    for input_name, output_name, lang in tasks:
+        with open(Path(base_path) / input_name, 'r', encoding='utf-8') as f:
+            lessons = json.load(f)
+        for index, lesson in enumerate(lessons):
+            for field, part, kind, text in lesson_segments(lesson):
+                if text and len(text.strip()) > 0:
+                    rows.append((input_name, output_name, lang, index, field, part, kind, text, now))
+
+    conn.execute("BEGIN IMMEDIATE")
+    conn.executemany("""
+        INSERT INTO jobs (source, output, lang, lesson, field, part, kind, text, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (output, lesson, field, part) DO UPDATE SET
+            source = excluded.source, lang = excluded.lang, kind = excluded.kind, text = excluded.text,
+            status = 'pending', result = NULL, error = NULL, attempts = 0,
+            lease_owner = NULL, lease_expires = NULL, updated_at = excluded.updated_at
+        WHERE jobs.text != excluded.text OR jobs.status = 'failed'
+    """, rows)
+
+    # Segments that no longer exist in the source (removed questions, fewer chunks)
+    current = {(output, lesson, field, part) for _, output, _, lesson, field, part, _, _, _ in rows}
+    outputs = sorted({output for _, output, _ in tasks})
+    existing = conn.execute(
+        f"SELECT id, output, lesson, field, part FROM jobs WHERE output IN ({', '.join('?' * len(outputs))})",
+        outputs).fetchall()
+    conn.executemany("DELETE FROM jobs WHERE id = ?", [(row[0],) for row in existing if tuple(row[1:]) not in current])
+    conn.execute("COMMIT")
+    return len(rows)
+
+def lease(conn, worker_id, lease_seconds=LEASE_SECONDS, max_attempts=MAX_ATTEMPTS):
+    """
+    Atomically take one pending job whose retry delay has passed, or one whose lease
+    expired. A job whose lease expired max_attempts times (it keeps killing or hanging
+    its worker) is marked failed. For pending jobs lease_expires holds the retry time.
+    """
+    now = time.time()
+    conn.execute("""
+        UPDATE jobs SET status = 'failed', error = 'lease expired ' || attempts || ' times',
+                        lease_owner = NULL, lease_expires = NULL, updated_at = ?
+        WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?
+    """, (now, now, max_attempts))
+    return conn.execute("""
+        UPDATE jobs SET status = 'leased', lease_owner = ?, lease_expires = ?,
+                        attempts = attempts + 1, updated_at = ?
+        WHERE id = (
+            SELECT id FROM jobs
+            WHERE (status = 'pending' AND (lease_expires IS NULL OR lease_expires <= ?))
+               OR (status = 'leased' AND lease_expires < ? AND attempts < ?)
+            ORDER BY id LIMIT 1
+        )
+        RETURNING id, lang, kind, text, source, lesson
+    """, (worker_id, now + lease_seconds, now, now, now, max_attempts)).fetchone()
+
+def complete(conn, job_id, worker_id, result):
+    """
+    Store a result; returns False if the lease was lost to another worker meanwhile
+    """
+    cursor = conn.execute("""
+        UPDATE jobs SET status = 'done', result = ?, error = NULL, lease_owner = NULL,
+                        lease_expires = NULL, updated_at = ?
+        WHERE id = ? AND lease_owner = ? AND status = 'leased'
+    """, (result, time.time(), job_id, worker_id))
+    return cursor.rowcount == 1
+
+def release(conn, job_id, worker_id, error, max_attempts=MAX_ATTEMPTS, retry_seconds=RETRY_SECONDS):
+    """
+    Give a failed job back to the queue after an exponential retry delay,
+    or mark it failed after max_attempts
+    """
+    now = time.time()
+    conn.execute("""
+        UPDATE jobs SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                        lease_expires = CASE WHEN attempts >= ? THEN NULL
+                                             ELSE ? + ? * (1 << (attempts - 1)) END,
+                        error = ?, lease_owner = NULL, updated_at = ?
+        WHERE id = ? AND lease_owner = ?
+    """, (max_attempts, max_attempts, now, retry_seconds, error, now, job_id, worker_id))
+
+class Heartbeat(threading.Thread):
+    """
+    Extends the lease of the job a worker is currently translating
+    """
+
+    def __init__(self, queue_path, worker_id, lease_seconds=LEASE_SECONDS, interval=HEARTBEAT_SECONDS):
+        super().__init__(daemon=True)
+        self.queue_path = queue_path
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self.interval = interval
+        self.job_id = None
+        self.stopped = threading.Event()
+
+    def run(self):
+        conn = connect(self.queue_path)
+        try:
+            while not self.stopped.wait(self.interval):
+                job_id = self.job_id
+                if job_id is not None:
+                    conn.execute("UPDATE jobs SET lease_expires = ? WHERE id = ? AND lease_owner = ?",
+                                 (time.time() + self.lease_seconds, job_id, self.worker_id))
+        finally:
+            conn.close()
+
+    def stop(self):
+        self.stopped.set()
+
+def work(queue_path, router, worker_id=None, lease_seconds=LEASE_SECONDS,
+         heartbeat_seconds=HEARTBEAT_SECONDS, pause=None, base_path=None):
+    """
+    Lease, translate and commit jobs until none are pending or leased
+    """
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+    pause = translate_with_openai.CALL_PAUSE if pause is None else pause
+    base_path = Path(base_path or Path(__file__).parent)
+    conn = connect(queue_path)
+    heartbeat = Heartbeat(queue_path, worker_id, lease_seconds, heartbeat_seconds)
+    heartbeat.start()
+    done = lost = 0
+    sources = {}
+
+    print(f"👷 Worker {worker_id} ({router.describe()})")
+    try:
+        while True:
+            job = lease(conn, worker_id, lease_seconds)
+            if job is None:
+                # Others may still hold leases that could expire; wait until everything is settled
+                busy = conn.execute("SELECT COUNT(*) FROM jobs WHERE status IN ('pending', 'leased')").fetchone()[0]
+                if busy == 0:
+                    break
+                time.sleep(POLL_SECONDS)
+                continue
+
+            job_id, lang, kind, text, source, lesson_index = job
+            heartbeat.job_id = job_id
+            # Every GPT call in a language shares the cached stable prefix; the lesson context follows it
+            if source not in sources:
+                with open(base_path / source, 'r', encoding='utf-8') as f:
+                    sources[source] = json.load(f)
+            lessons = sources[source]
+            translation_gpt.set_lesson_context(
+                lessons[lesson_index] if lesson_index < len(lessons) else None, lang)
+            try:
+                # Backends raise instead of returning the source text, so failures are retried
+                result = router.translate(text, lang, kind, raise_on_failure=True)
+                # Merged or split option lines would shift correctAnswerIndex
+                if (kind == 'options' and len(parse_options(result)) != len(parse_options(text))
+                        and router.pick(text, kind) != router.quality):
+                    result = router.translate(text, lang, kind, backend=router.quality, raise_on_failure=True)
+            except Exception as e:
+                print(f"   ⚠️ Job {job_id} failed: {e}")
+                release(conn, job_id, worker_id, str(e))
+                continue
+            finally:
+                heartbeat.job_id = None
+
+            if complete(conn, job_id, worker_id, result):
+                done += 1
+            else:
+                lost += 1
+            if pause:
+                time.sleep(pause)
+    finally:
+        heartbeat.stop()
+        conn.close()
+
+    print(f"✅ Worker {worker_id} finished: {done} committed, {lost} lost leases")
+    if translation_gpt.usage['requests']:
+        print(f"   {translation_gpt.format_usage()}")
+    return done
+
+def status(conn):
+    """
+    Job counts per output file and status
+    """
+    rows = conn.execute("SELECT output, status, COUNT(*) FROM jobs GROUP BY output, status ORDER BY output").fetchall()
+    summary = {}
+    for output, job_status, count in rows:
+        summary.setdefault(output, {})[job_status] = count
+    return summary
+
+def assemble(conn, base_path, partial=False):
+    """
+    Write output files from committed results; untranslated segments keep the source text
+    """
+    base_path = Path(base_path)
+    outputs = conn.execute("SELECT DISTINCT source, output FROM jobs ORDER BY output").fetchall()
+    written = []
+
+    for source_name, output_name in outputs:
+        pending = conn.execute("SELECT COUNT(*) FROM jobs WHERE output = ? AND status != 'done'",
+                               (output_name,)).fetchone()[0]
+        if pending and not partial:
+            print(f"  ⏳ {output_name}: {pending} segments not translated yet, skipping (use --partial)")
+            continue
+
+        with open(base_path / source_name, 'r', encoding='utf-8') as f:
+            lessons = json.load(f)
+        translated = copy.deepcopy(lessons)
+
+        chunks = {}
+        mismatched = 0
+        rows = conn.execute("""
+            SELECT lesson, field, part, result FROM jobs
+            WHERE output = ? AND status = 'done' ORDER BY lesson, field, part
+        """, (output_name,))
+        for lesson_index, field, part, result in rows:
+            lesson = translated[lesson_index]
+            if field in CONTENT_FIELDS:
+                chunks.setdefault((lesson_index, field), {})[part] = result
+            elif field.startswith('quizQuestions.'):
+                _, q_index, key = field.split('.')
+                question = lesson['quizQuestions'][int(q_index)]
+                if key != 'options':
+                    question[key] = result
+                elif len(parse_options(result)) == len(question['options']):
+                    question[key] = parse_options(result)
+                else:
+                    mismatched += 1  # keep the source options so correctAnswerIndex stays valid
+            else:
+                lesson[field] = result
+
+        for (lesson_index, field), parts in chunks.items():
+            expected = split_into_chunks(lessons[lesson_index][field])
+            # Parts that are missing (partial run) keep their source chunk
+            translated[lesson_index][field] = '\n\n'.join(parts.get(i, chunk) for i, chunk in enumerate(expected))
+
+        with open(base_path / output_name, 'w', encoding='utf-8') as f:
+            json.dump(translated, f, ensure_ascii=False, indent=2)
+        written.append(output_name)
+        print(f"  💾 {output_name}: {len(translated)} lessons{f' ({pending} segments untranslated)' if pending else ''}")
+        if mismatched:
+            print(f"     ⚠️ {mismatched} option lists had the wrong number of options; source options kept")
+
+    return written
+
+def main():
+    parser = argparse.ArgumentParser(description="Distributed translation work queue")
+    parser.add_argument('--queue', default=str(DEFAULT_QUEUE), help="SQLite queue file shared by all workers")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    p = commands.add_parser('enqueue', help="add segment jobs for a translation task")
+    p.add_argument('--choice', default='7', choices=sorted(TASKS), help="task as in translate_with_openai.py menu")
+
+    p = commands.add_parser('work', help="translate jobs until the queue is drained")
+    p.add_argument('--route', action='store_true', help="short segments to the cheapest available backend")
+    p.add_argument('--backend', choices=sorted(BACKENDS), help="translate everything with one backend")
+    p.add_argument('--worker-id', help="default: host-pid-random")
+    p.add_argument('--lease', type=float, default=LEASE_SECONDS, help="lease length in seconds")
+    p.add_argument('--heartbeat', type=float, default=HEARTBEAT_SECONDS, help="lease renewal interval")
+    p.add_argument('--pause', type=float, help="seconds between requests of this worker")
+
+    commands.add_parser('status', help="show job counts")
+
+    p = commands.add_parser('assemble', help="write output JSON files from committed results")
+    p.add_argument('--partial', action='store_true', help="also write files with untranslated segments")
+
+    args = parser.parse_args()
+    base_path = Path(__file__).parent
+
+    if args.command == 'work':
+        if args.backend:
+            router = Router(fast=args.backend, quality=args.backend)
+        elif args.route:
+            router = Router(quality='openai')
+        else:
+            router = Router(fast='openai', quality='openai')
+        if 'openai' in (router.fast, router.quality):
+            # Fail before leasing anything rather than burning every job's attempts
+            try:
+                translation_gpt.get_client()
+            except RuntimeError as e:
+                print(f"ERROR: {e}")
+                return
+        work(args.queue, router, args.worker_id, args.lease, args.heartbeat, args.pause, base_path)
+        return
+
+    conn = connect(args.queue)
+    try:
+        if args.command == 'enqueue':
+            count = enqueue(conn, TASKS[args.choice], base_path)
+            print(f"✓ {count} segments in queue for task {args.choice}")
+            for output, counts in status(conn).items():
+                print(f"  {output}: {counts}")
+        elif args.command == 'status':
+            for output, counts in status(conn).items():
+                print(f"  {output}: {counts}")
+        elif args.command == 'assemble':
+            assemble(conn, base_path, partial=args.partial)
+    finally:
+        conn.close()
+
+if __name__ == '__main__':
+    main()
@@ -9,6 +9,7 @@ import { useQuizConfig } from '../contexts/QuizConfigContext'
 import RealWorldCaseStudy from '../components/RealWorldCaseStudy'
 import { useAuth } from '../context/AuthContext'
 import { getAllowedAttempts, addRequest } from '../services/admin'
+import { loadRelated, relatedLessons, sourceParagraph, type SourceParagraph } from '../services/related'
 
 function slugify(s: string) {
   return s
@@ -83,25 +84,40 @@ export default function LessonPage() {
         return
       }
       // Need to augment with more questions from other lessons to reach desired count
-      const allLessons = await cms.fetchLessons(language)
-      const pool: any[] = []
+      const [allLessons, graph] = await Promise.all([cms.fetchLessons(language), loadRelated(language)])
+      // Questions from related lessons come first, the rest of the corpus fills up
+      const related = new Set(relatedLessons(graph, lesson.slug))
+      const near: any[] = []
+      const far: any[] = []
       allLessons.forEach(ls => {
         if (ls.id !== lesson.id && Array.isArray(ls.quizQuestions)) {
-          pool.push(...(ls.quizQuestions as any[]))
+          (related.has(ls.slug) ? near : far).push(...(ls.quizQuestions as any[]))
         }
       })
-      // Shuffle pool
-      for (let i = pool.length - 1; i > 0; i--) {
-        const j = Math.floor(Math.random() * (i + 1))
-        ;[pool[i], pool[j]] = [pool[j], pool[i]]
+      // Shuffle each pool
+      for (const pool of [near, far]) {
+        for (let i = pool.length - 1; i > 0; i--) {
+          const j = Math.floor(Math.random() * (i + 1))
+          ;[pool[i], pool[j]] = [pool[j], pool[i]]
+        }
       }
       const need = desired - base.length
-      const extras = pool.slice(0, Math.max(0, need))
+      const extras = [...near, ...far].slice(0, Math.max(0, need))
       setFinalQuestions([...base, ...extras])
     }
     build()
   }, [lesson, language, currentEvent])
 
+  // Paragraph of this lesson behind each of its own questions; extras from other lessons get none
+  const [sources, setSources] = React.useState<(SourceParagraph | null)[]>([])
+  React.useEffect(() => {
+    if (!lesson || !finalQuestions) { setSources([]); return }
+    const own = ((lesson.quizQuestions as any[]) || []).length
+    loadRelated(language).then(graph => {
+      setSources(finalQuestions.map((_, i) => i < own ? sourceParagraph(graph, lesson, i) : null))
+    })
+  }, [lesson, language, finalQuestions])
+
   if (!lesson) return <div>Loading...</div>
 
   // Check if lesson is locked
@@ -987,6 +1003,7 @@ export default function LessonPage() {
                     <Quiz
                       lessonId={lesson.id}
                       questions={finalQuestions as any}
+                      sources={sources}
                       onSubmit={(score, answers)=>{
                         if (!user) return
                         // Build review details for admin (which were wrong, etc.)
@@ -121,7 +121,7 @@ export async function fetchLessons(language: Language = 'sl'): Promise<Lesson[]>
       return allLessons.sort((a, b) => a.id - b.id)
     }
 
-    const res = await api.get(`/api/lessons?populate=deep`)
+    const res = await api.get(`/api/lessons?locale=${language}&populate=deep`)
     // adapt to Strapi response shape
     return res.data.data.map((d: unknown) => ({ id: (d as any).id, ...((d as any).attributes) }))
   } catch (error: any) {
@@ -141,7 +141,7 @@ export async function fetchLessonBySlug(slug: string, language: Language = 'sl')
       return lesson || null
     }
 
-    const res = await api.get(`/api/lessons?filters[slug][$eq]=${encodeURIComponent(slug)}&populate=deep`)
+    const res = await api.get(`/api/lessons?locale=${language}&filters[slug][$eq]=${encodeURIComponent(slug)}&populate=deep`)
     const data = res.data.data[0]
     if (!data) return null
     return { id: data.id, ...data.attributes }
@@ -0,0 +1,67 @@
+import type { Language, Lesson } from './cms'
+import { buildRows, type Row } from './search'
+
+// Precomputed by src/content/build_related_content.py (run it after editing lesson files)
+export type RelatedGraph = {
+  lang: Language
+  k: number
+  sections: string[]
+  lessons: Record<string, [string, number][]>
+  questions: Record<string, ([number, number, number] | null)[]>
+}
+
+export type SourceParagraph = { section: Row['section']; paragraph: number; score: number; text: string }
+
+// Same labels buildRows() gives the three lesson sections, in build order
+const SECTION_LABELS: Row['section'][] = ['Razlaga', 'Izzivi', 'Izboljšave']
+
+const cache: Partial<Record<Language, Promise<RelatedGraph | null>>> = {}
+
+export function loadRelated(language: Language): Promise<RelatedGraph | null> {
+  if (!cache[language]) {
+    cache[language] = import(`../content/related-${language}.json`)
+      // Template import is untyped; the JSON's number arrays stand in for the tuples above
+      .then((m: { default: unknown }) => m.default as RelatedGraph)
+      .catch(() => {
+        console.warn(`No related-content graph for ${language}`)
+        return null
+      })
+  }
+  return cache[language]!
+}
+
+// Slugs of the most similar lessons, best first
+export function relatedLessons(graph: RelatedGraph | null, slug: string, limit?: number): string[] {
+  const links = graph?.lessons[slug] || []
+  return links.slice(0, limit ?? links.length).map(([s]) => s)
+}
+
+// Longest paragraph text shown under a quiz answer
+const MAX_SOURCE_CHARS = 280
+
+// Shorter rows are headings ("KONTAKTNI ČAS:"), shown together with the row after them
+const HEADING_CHARS = 40
+
+function plainText(row?: Row) {
+  return (row?.text || '').replace(/\*\*/g, '').replace(/^(#+|>|[-*•]|\d+\.)\s*/, '').trim()
+}
+
+// Paragraph of the same lesson that best explains quiz question questionIndex, with its text
+// (Markdown markers stripped); paragraph indexes count rows of that section as produced by buildRows()
+export function sourceParagraph(graph: RelatedGraph | null, lesson: Lesson, questionIndex: number): SourceParagraph | null {
+  const match = graph?.questions[lesson.slug]?.[questionIndex]
+  if (!match) return null
+  const [section, paragraph, score] = match
+  const rows = buildRows([lesson]).filter(r => r.section === SECTION_LABELS[section])
+  // Graph built from an older version of the lesson
+  if (!rows[paragraph]) return null
+  let text = plainText(rows[paragraph])
+  if (text.length < HEADING_CHARS && rows[paragraph + 1]) text = `${text} ${plainText(rows[paragraph + 1])}`
+  if (!text) return null
+  return {
+    section: SECTION_LABELS[section],
+    paragraph,
+    score,
+    text: text.length > MAX_SOURCE_CHARS ? text.slice(0, MAX_SOURCE_CHARS).trimEnd() + '…' : text,
+  }
+}
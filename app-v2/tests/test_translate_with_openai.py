@@ -0,0 +1,87 @@
+"""
+Runs translate_with_openai.py as a script (as documented) against a fake openai
+package and checks that every GPT request carries the shared prompt prefix and
+that cached-token usage is reported.
+
+    python -m pytest tests/test_translate_with_openai.py
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+CONTENT_DIR = Path(__file__).resolve().parent.parent / 'src' / 'content'
+sys.path.insert(0, str(CONTENT_DIR))
+
+import translation_gpt  # noqa: E402
+import translation_plan  # noqa: E402
+
+# Records every chat.completions.create call to $FAKE_OPENAI_LOG and echoes the segment back
+FAKE_OPENAI = textwrap.dedent('''
+    import json, os
+    from types import SimpleNamespace
+
+    class _Completions:
+        def create(self, **kwargs):
+            with open(os.environ['FAKE_OPENAI_LOG'], 'a', encoding='utf-8') as f:
+                f.write(json.dumps(kwargs, ensure_ascii=False) + '\\n')
+            text = kwargs['messages'][-1]['content'].split('\\n\\n', 1)[1]
+            usage = SimpleNamespace(prompt_tokens=1200, completion_tokens=10,
+                                    prompt_tokens_details=SimpleNamespace(cached_tokens=1024))
+            message = SimpleNamespace(content=text)
+            return SimpleNamespace(usage=usage, choices=[SimpleNamespace(message=message)])
+
+    class OpenAI:
+        def __init__(self, *args, **kwargs):
+            self.chat = SimpleNamespace(completions=_Completions())
+''')
+
+def make_workdir(tmp_path):
+    for script in CONTENT_DIR.glob('*.py'):
+        shutil.copy(script, tmp_path / script.name)
+    with open(CONTENT_DIR / 'annex1-sl.json', 'r', encoding='utf-8') as f:
+        lesson = json.load(f)[1]
+    lesson['quizQuestions'] = lesson['quizQuestions'][:1]
+    with open(tmp_path / 'annex1-sl.json', 'w', encoding='utf-8') as f:
+        json.dump([lesson], f, ensure_ascii=False)
+
+    stub = tmp_path / 'stub' / 'openai'
+    stub.mkdir(parents=True)
+    (stub / '__init__.py').write_text(FAKE_OPENAI, encoding='utf-8')
+    return lesson
+
+def test_main_sends_shared_prefix_and_reports_cache(tmp_path):
+    lesson = make_workdir(tmp_path)
+    log = tmp_path / 'calls.jsonl'
+    env = dict(os.environ, PYTHONPATH=str(tmp_path / 'stub'), FAKE_OPENAI_LOG=str(log),
+               OPENAI_API_KEY='test', PYTHONIOENCODING='utf-8')
+
+    # Menu choice 1 (main lessons to English), then Enter to start
+    result = subprocess.run([sys.executable, 'translate_with_openai.py'], cwd=tmp_path, env=env,
+                            input='1\n\n', capture_output=True, text=True, encoding='utf-8', timeout=120)
+    assert result.returncode == 0, result.stderr
+
+    calls = [json.loads(line) for line in log.read_text(encoding='utf-8').splitlines()]
+    assert len(calls) >= 5
+    systems = {call['messages'][0]['content'] for call in calls}
+    assert len(systems) == 1
+    system = systems.pop()
+    assert system.startswith(translation_gpt.stable_prefix('en'))
+    assert lesson['title'] in system
+    assert {call['extra_body']['prompt_cache_key'] for call in calls} == {'translate-en'}
+
+    assert f"{len(calls)} GPT requests" in result.stdout
+    assert 'cached' in result.stdout
+
+    with open(tmp_path / 'annex1-en.json', 'r', encoding='utf-8') as f:
+        translated = json.load(f)
+    assert translated[0]['quizQuestions'][0]['options'] == lesson['quizQuestions'][0]['options']
+
+def test_stable_prefix_is_long_enough_to_be_cached():
+    for lang in ('en', 'hr'):
+        tokens = translation_plan.estimate_tokens(translation_gpt.stable_prefix(lang))
+        assert tokens >= translation_plan.CACHE_MIN_TOKENS
@@ -0,0 +1,90 @@
+"""
+Lease, retry and assemble paths of translation_queue.py against a queue in tmp_path.
+
+    python -m pytest tests/test_translation_queue.py
+"""
+
+import json
+import sys
+from pathlib import Path
+
+CONTENT_DIR = Path(__file__).resolve().parent.parent / 'src' / 'content'
+sys.path.insert(0, str(CONTENT_DIR))
+
+import translation_queue as queue  # noqa: E402
+
+LESSON = {
+    'id': 1,
+    'slug': 'test',
+    'title': 'Čisti prostor',
+    'quizQuestions': [
+        {'question': 'Kateri razred?', 'options': ['A', 'B', 'C'], 'correctAnswerIndex': 1},
+    ],
+}
+
+def make_queue(tmp_path):
+    with open(tmp_path / 'test-sl.json', 'w', encoding='utf-8') as f:
+        json.dump([LESSON], f, ensure_ascii=False)
+    conn = queue.connect(tmp_path / 'queue.sqlite')
+    queue.enqueue(conn, [('test-sl.json', 'test-en.json', 'en')], tmp_path)
+    return conn
+
+def job_row(conn, job_id):
+    return conn.execute("SELECT status, attempts, lease_owner FROM jobs WHERE id = ?", (job_id,)).fetchone()
+
+def test_expired_lease_is_reissued_and_old_owner_cannot_commit(tmp_path):
+    conn = make_queue(tmp_path)
+    first = queue.lease(conn, 'a', lease_seconds=-1)  # worker a hangs, its lease is already over
+    second = queue.lease(conn, 'b')
+    assert second[0] == first[0]
+    assert job_row(conn, first[0]) == ('leased', 2, 'b')
+
+    assert not queue.complete(conn, first[0], 'a', 'stale')
+    assert queue.complete(conn, first[0], 'b', 'Cleanroom')
+    assert conn.execute("SELECT result FROM jobs WHERE id = ?", (first[0],)).fetchone()[0] == 'Cleanroom'
+
+def test_released_job_waits_before_it_is_leased_again(tmp_path):
+    conn = make_queue(tmp_path)
+    job = queue.lease(conn, 'a')
+    queue.release(conn, job[0], 'a', 'HTTP 429')
+    assert job_row(conn, job[0]) == ('pending', 1, None)
+
+    # The next lease skips the delayed job instead of handing it straight back
+    assert queue.lease(conn, 'a')[0] != job[0]
+
+def test_job_fails_after_max_attempts(tmp_path):
+    conn = make_queue(tmp_path)
+    job_id = None
+    for attempt in range(1, queue.MAX_ATTEMPTS + 1):
+        job = queue.lease(conn, 'a')
+        job_id = job_id or job[0]
+        assert job[0] == job_id
+        queue.release(conn, job_id, 'a', 'boom', retry_seconds=0)
+    assert job_row(conn, job_id) == ('failed', queue.MAX_ATTEMPTS, None)
+
+    # A job whose lease keeps expiring is failed as well
+    other = queue.lease(conn, 'a', lease_seconds=-1)[0]
+    for _ in range(queue.MAX_ATTEMPTS - 1):
+        assert queue.lease(conn, 'a', lease_seconds=-1)[0] == other
+    queue.lease(conn, 'a')
+    assert job_row(conn, other)[0] == 'failed'
+
+    # Failed jobs block assemble, and enqueue puts them back in the queue
+    assert queue.assemble(conn, tmp_path) == []
+    queue.enqueue(conn, [('test-sl.json', 'test-en.json', 'en')], tmp_path)
+    assert job_row(conn, job_id) == ('pending', 0, None)
+
+def test_assemble_keeps_source_options_on_count_mismatch(tmp_path):
+    conn = make_queue(tmp_path)
+    translations = {'title': 'Cleanroom', 'question': 'Which grade?', 'options': '1. A and B\n2. C'}
+    while (job := queue.lease(conn, 'a')) is not None:
+        job_id, _, kind = job[:3]
+        assert queue.complete(conn, job_id, 'a', translations[kind])
+
+    assert queue.assemble(conn, tmp_path) == ['test-en.json']
+    with open(tmp_path / 'test-en.json', 'r', encoding='utf-8') as f:
+        lesson = json.load(f)[0]
+    assert lesson['title'] == 'Cleanroom'
+    question = lesson['quizQuestions'][0]
+    assert question['question'] == 'Which grade?'
+    assert question['options'] == LESSON['quizQuestions'][0]['options']
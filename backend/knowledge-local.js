@@ -0,0 +1,78 @@
+// Local keyword search over lessons and quiz questions (SQLite FTS5)
+// Index is built by scripts/build_knowledge_index.py – works offline, no Cosmos/embeddings needed
+import 'dotenv/config'
+import fs from 'fs'
+import path from 'path'
+import { fileURLToPath } from 'url'
+import Database from 'better-sqlite3'
+
+const __dirname = path.dirname(fileURLToPath(import.meta.url))
+const {
+  KNOWLEDGE_INDEX_PATH = path.join(__dirname, 'database', 'knowledge.sqlite'),
+} = process.env
+
+export const LANGUAGES = ['sl', 'en', 'hr']
+// Must match COLUMN_WEIGHTS in scripts/build_knowledge_index.py (title, body, aliases)
+const COLUMN_WEIGHTS = '2.0, 1.0, 1.0'
+// Letters the unicode61 tokenizer does not fold (indexed as aliases by the builder)
+const EXTRA_FOLD = { 'đ': 'd', 'Đ': 'D', 'ł': 'l', 'Ł': 'L', 'ø': 'o', 'Ø': 'O', 'ß': 'ss' }
+
+let db
+const statements = {}
+
+function getDb() {
+  if (!db) {
+    db = new Database(KNOWLEDGE_INDEX_PATH, { readonly: true, fileMustExist: true })
+  }
+  return db
+}
+
+function getStatement(lang) {
+  if (!statements[lang]) {
+    statements[lang] = getDb().prepare(`
+      SELECT lesson_id AS lessonId, slug, source, section, position,
+             COALESCE(NULLIF(snippet(knowledge_${lang}, 1, '[', ']', '…', 16), ''), title) AS snippet,
+             bm25(knowledge_${lang}, ${COLUMN_WEIGHTS}) * weight AS score
+      FROM knowledge_${lang}
+      WHERE knowledge_${lang} MATCH ?
+      ORDER BY score
+      LIMIT ?`)
+  }
+  return statements[lang]
+}
+
+export function isLocalIndexAvailable() {
+  return fs.existsSync(KNOWLEDGE_INDEX_PATH)
+}
+
+function fold(text) {
+  return text.replace(/[đĐłŁøØß]/g, c => EXTRA_FOLD[c])
+    .normalize('NFD').replace(/[\u0300-\u036f]/g, '').toLowerCase()
+}
+
+function matchExpression(query, operator) {
+  const terms = fold(query).split(/[^\p{L}\p{N}]+/u).filter(Boolean)
+  if (terms.length === 0) return null
+  const quoted = terms.map(t => `"${t}"`)
+  if (terms[terms.length - 1].length >= 3) quoted[quoted.length - 1] += '*'
+  return quoted.join(operator)
+}
+
+export function keywordSearch({ query, lang = 'sl', k = 10 }) {
+  if (!LANGUAGES.includes(lang)) throw new Error(`Unsupported language: ${lang}`)
+  const stmt = getStatement(lang)
+  // All terms first, then any term if nothing matches all of them
+  for (const operator of [' ', ' OR ']) {
+    const expression = matchExpression(query, operator)
+    if (!expression) return []
+    const hits = stmt.all(expression, k)
+    if (hits.length) return hits
+  }
+  return []
+}
+
+export default {
+  LANGUAGES,
+  isLocalIndexAvailable,
+  keywordSearch,
+}
@@ -5,6 +5,7 @@ import axios from 'axios'
 import { parseString } from 'xml2js'
 import { promisify } from 'util'
 import cosmos from './knowledge-cosmos.js'
+import localKnowledge from './knowledge-local.js'
 import * as gemini from './gemini-chat.js'
 
 const parseXML = promisify(parseString)
@@ -28,7 +29,8 @@ app.get('/api/health', (req, res) => {
     ok: true, 
     time: new Date().toISOString(),
     gemini: gemini.isGeminiAvailable(),
-    cosmos: cosmos.isCosmosAvailable?.() || false
+    cosmos: cosmos.isCosmosAvailable?.() || false,
+    localIndex: localKnowledge.isLocalIndexAvailable()
   })
 })
 
@@ -283,6 +285,27 @@ app.post('/api/knowledge/index', async (req, res) => {
   }
 })
 
+// --- Local FTS5 keyword search (offline, built by scripts/build_knowledge_index.py) ---
+app.post('/api/knowledge/local-search', (req, res) => {
+  try {
+    const { q, lang = 'sl', k = 10 } = req.body || {}
+    if (!q || typeof q !== 'string') return res.status(400).json({ error: 'Missing q' })
+    if (!localKnowledge.LANGUAGES.includes(lang)) {
+      return res.status(400).json({ error: `Unsupported lang, use one of: ${localKnowledge.LANGUAGES.join(', ')}` })
+    }
+    if (!localKnowledge.isLocalIndexAvailable()) {
+      return res.status(503).json({ error: 'Local index not built. Run: python scripts/build_knowledge_index.py' })
+    }
+    // Whole number in 1..50: SQLite reads a negative LIMIT as "no limit" and rejects fractions
+    const limit = Math.max(1, Math.min(50, Math.trunc(Number(k)) || 10))
+    const hits = localKnowledge.keywordSearch({ query: q, lang, k: limit })
+    res.json({ hits })
+  } catch (e) {
+    console.error('Local search failed:', e.message)
+    res.status(500).json({ error: e.message })
+  }
+})
+
 // Ensure Cosmos DB container exists on boot (non-blocking)
 cosmos.ensureCosmos().then(r => {
   if (r.enabled) console.log('✅ Cosmos DB ready with vector policy')
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Build a SQLite FTS5 keyword index of all lessons and quiz questions
+One FTS table per language (knowledge_sl, knowledge_en, knowledge_hr), queried
+by knowledge-local.js in the proxy without Cosmos DB or embeddings.
+
+Usage:
+    python build_knowledge_index.py            # build database/knowledge.sqlite
+    python build_knowledge_index.py --bench    # build and benchmark queries
+    python build_knowledge_index.py --query "hepa filter" --lang hr
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+import statistics
+import time
+import unicodedata
+from pathlib import Path
+
+BASE_PATH = Path(__file__).resolve().parent.parent
+CONTENT_DIR = BASE_PATH.parent / 'app-v2' / 'src' / 'content'
+DEFAULT_OUTPUT = BASE_PATH / 'database' / 'knowledge.sqlite'
+
+LANGUAGES = ['sl', 'en', 'hr']
+
+# Lesson files per language: source key -> file name pattern
+SOURCES = {
+    'annex1': 'annex1-{lang}.json',
+    'annex1-advanced': 'annex1-advanced-{lang}.json',
+}
+
+# BM25 multiplier per section (same ordering as SECTION_WEIGHT in app-v2/src/services/search.ts)
+SECTION_WEIGHT = {
+    'title': 1.5,
+    'development': 1.0,
+    'question': 0.9,
+    'explanation': 0.9,
+    'challenges': 0.85,
+    'improvements': 0.75,
+}
+
+CONTENT_SECTIONS = [
+    ('developmentAndExplanation', 'development'),
+    ('practicalChallenges', 'challenges'),
+    ('improvementIdeas', 'improvements'),
+]
+
+# bm25() column weights for (title, body, aliases)
+COLUMN_WEIGHTS = (2.0, 1.0, 1.0)
+
+# Letters the unicode61 tokenizer does not fold (no Unicode decomposition)
+EXTRA_FOLD = str.maketrans({'đ': 'd', 'Đ': 'D', 'ł': 'l', 'Ł': 'L', 'ø': 'o', 'Ø': 'O', 'ß': 'ss'})
+
+TOKEN_RE = re.compile(r'[^\W_]+')
+
+# Sample queries for --bench
+BENCH_QUERIES = {
+    'sl': ['hepa filter', 'razred a', 'okoljski monitoring', 'tok zraka', 'ccs', 'aseptično polnjenje',
+           'diferenčni tlak', 'oblačenje osebja', 'validacija čiščenja', 'delci 0,5'],
+    'en': ['hepa filter', 'grade a', 'environmental monitoring', 'airflow', 'ccs', 'aseptic filling',
+           'differential pressure', 'gowning', 'cleaning validation', 'particles 0.5'],
+    'hr': ['hepa filter', 'razred a', 'praćenje okoliša', 'protok zraka', 'ccs', 'aseptično punjenje',
+           'diferencijalni tlak', 'između', 'validacija čišćenja', 'čestice 0,5'],
+}
+
+def fold(text):
+    """
+    Lowercase and strip diacritics, including letters unicode61 leaves alone (đ, ł, ...)
+    """
+    text = unicodedata.normalize('NFD', text.translate(EXTRA_FOLD))
+    return ''.join(c for c in text if not unicodedata.combining(c)).lower()
+
+def aliases(text):
+    """
+    Folded forms of tokens the tokenizer would not fold itself, e.g. "između" -> "izmedu"
+    """
+    return ' '.join(sorted({fold(tok) for tok in TOKEN_RE.findall(text) if tok.translate(EXTRA_FOLD) != tok}))
+
+def paragraphs(text):
+    """
+    Split section text into non-empty lines, like buildRows() in search.ts
+    """
+    return [p.strip() for p in (text or '').split('\n') if p.strip()]
+
+def lesson_rows(lesson):
+    """
+    Yield (title, body, section, position) rows for one lesson
+    """
+    yield lesson['title'], '', 'title', 0
+
+    for field, section in CONTENT_SECTIONS:
+        for i, para in enumerate(paragraphs(lesson.get(field))):
+            yield '', para, section, i
+
+    for i, q in enumerate(lesson.get('quizQuestions') or []):
+        question = '\n'.join([q['question']] + list(q.get('options') or []))
+        yield '', question, 'question', i
+        explanation = '\n'.join(filter(None, [q.get('explanation'), q.get('hint')]))
+        if explanation:
+            yield '', explanation, 'explanation', i
+
+def create_table(conn, lang):
+    conn.execute(f"""
+        CREATE VIRTUAL TABLE knowledge_{lang} USING fts5(
+            title, body, aliases,
+            lesson_id UNINDEXED, slug UNINDEXED, source UNINDEXED,
+            section UNINDEXED, position UNINDEXED, weight UNINDEXED,
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '3'
+        )
+    """)
+
+def build_index(output=DEFAULT_OUTPUT, content_dir=CONTENT_DIR, languages=LANGUAGES):
+    """
+    Build the index into a temporary file and swap it in, so readers never see a partial index
+    """
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp = output.with_name(output.name + '.tmp')
+    if tmp.exists():
+        tmp.unlink()
+
+    counts = {}
+    conn = sqlite3.connect(tmp)
+    try:
+        conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+        for lang in languages:
+            create_table(conn, lang)
+            rows = []
+            for source, pattern in SOURCES.items():
+                path = Path(content_dir) / pattern.format(lang=lang)
+                if not path.exists():
+                    print(f"  ⚠️ Missing {path.name}, skipping")
+                    continue
+                with open(path, 'r', encoding='utf-8') as f:
+                    lessons = json.load(f)
+                for lesson in lessons:
+                    for title, body, section, position in lesson_rows(lesson):
+                        rows.append((
+                            title, body, aliases(title + ' ' + body),
+                            lesson['id'], lesson.get('slug'), source,
+                            section, position, SECTION_WEIGHT[section],
+                        ))
+            conn.executemany(f"INSERT INTO knowledge_{lang} VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            conn.execute(f"INSERT INTO knowledge_{lang}(knowledge_{lang}) VALUES ('optimize')")
+            counts[lang] = len(rows)
+
+        conn.executemany("INSERT INTO meta VALUES (?, ?)", [
+            ('built_at', time.strftime('%Y-%m-%dT%H:%M:%S')),
+            ('languages', ','.join(counts)),
+            ('column_weights', ','.join(str(w) for w in COLUMN_WEIGHTS)),
+        ])
+        conn.commit()
+    finally:
+        conn.close()
+
+    os.replace(tmp, output)
+    return counts
+
+def match_expression(query, operator=' '):
+    """
+    Turn free text into a safe FTS5 MATCH expression; the last term also matches as a prefix
+    """
+    terms = TOKEN_RE.findall(fold(query))
+    if not terms:
+        return None
+    quoted = [f'"{t}"' for t in terms]
+    if len(terms[-1]) >= 3:
+        quoted[-1] += '*'
+    return operator.join(quoted)
+
+def search(conn, lang, query, k=10):
+    """
+    Ranked hits for a query: all terms first, any term if nothing matches all of them
+    """
+    if lang not in LANGUAGES:
+        raise ValueError(f"Unsupported language: {lang}")
+    sql = f"""
+        SELECT lesson_id, slug, source, section, position,
+               COALESCE(NULLIF(snippet(knowledge_{lang}, 1, '[', ']', '…', 16), ''), title) AS snippet,
+               bm25(knowledge_{lang}, {', '.join(str(w) for w in COLUMN_WEIGHTS)}) * weight AS score
+        FROM knowledge_{lang}
+        WHERE knowledge_{lang} MATCH ?
+        ORDER BY score
+        LIMIT ?
+    """
+    for operator in (' ', ' OR '):
+        expression = match_expression(query, operator)
+        if expression is None:
+            return []
+        hits = conn.execute(sql, (expression, k)).fetchall()
+        if hits:
+            return hits
+    return []
+
+def benchmark(conn, languages=LANGUAGES, repeat=200):
+    """
+    Time every sample query and print mean/p50/p95 latency per language
+    """
+    print("\n" + "="*70)
+    print(f"QUERY BENCHMARK ({repeat} runs per query)")
+    print("="*70)
+    for lang in languages:
+        timings = []
+        for query in BENCH_QUERIES.get(lang, []):
+            search(conn, lang, query)  # warm up
+            for _ in range(repeat):
+                start = time.perf_counter()
+                search(conn, lang, query)
+                timings.append((time.perf_counter() - start) * 1000)
+        if not timings:
+            continue
+        timings.sort()
+        p95 = timings[int(len(timings) * 0.95) - 1]
+        print(f"  {lang.upper()}: mean {statistics.mean(timings):.3f} ms, "
+              f"p50 {statistics.median(timings):.3f} ms, p95 {p95:.3f} ms")
+    print("="*70 + "\n")
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the SQLite FTS5 knowledge index")
+    parser.add_argument('--output', default=str(DEFAULT_OUTPUT))
+    parser.add_argument('--content', default=str(CONTENT_DIR), help="directory with annex1-*.json")
+    parser.add_argument('--bench', action='store_true', help="benchmark sample queries after building")
+    parser.add_argument('--query', help="run one query against the built index")
+    parser.add_argument('--lang', default='sl', choices=LANGUAGES)
+    parser.add_argument('--no-build', action='store_true', help="use the existing index")
+    args = parser.parse_args()
+
+    if not args.no_build:
+        start = time.perf_counter()
+        counts = build_index(args.output, args.content)
+        elapsed = time.perf_counter() - start
+        print(f"✓ Indexed {sum(counts.values()):,} rows "
+              f"({', '.join(f'{lang}: {n:,}' for lang, n in counts.items())}) in {elapsed:.2f}s")
+        print(f"  Saved to {args.output}")
+
+    conn = sqlite3.connect(args.output)
+    try:
+        if args.query:
+            for lesson_id, slug, source, section, position, snippet, score in search(conn, args.lang, args.query):
+                print(f"  {score:8.3f}  Lesson {lesson_id} [{section}#{position}] {snippet}")
+        if args.bench:
+            benchmark(conn)
+    finally:
+        conn.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Bulk import of annex1 lesson JSON into the Strapi lesson/quiz/question/option tables
+Every annex1-{lang}.json / annex1-advanced-{lang}.json is loaded in one transaction
+with batched multi-row inserts. Rows get a stable document_id derived from their
+position in the content (shared across languages, one localized row per locale,
+the content types enable i18n), and a content hash ledger lets unchanged rows be
+skipped on the next run. Like Strapi's draft & publish, every document gets a draft
+row (published_at NULL) and a published row with their own relation links, so the
+admin can edit and republish imported content; the next import overwrites both
+versions of a document whose source JSON changed.
+
+Usage:
+    python import_content.py --standin                 # import into database/standin.sqlite
+    python import_content.py --db ../.tmp/data.db      # import into the Strapi SQLite database
+    python import_content.py --standin --bench         # time a full reload against an incremental one
+"""
+
+import argparse
+import hashlib
+import json
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+BASE_PATH = Path(__file__).resolve().parent.parent
+CONTENT_DIR = BASE_PATH.parent / 'app-v2' / 'src' / 'content'
+STRAPI_DB = BASE_PATH / '.tmp' / 'data.db'
+STANDIN_DB = BASE_PATH / 'database' / 'standin.sqlite'
+
+LANGUAGES = ['sl', 'en', 'hr']
+
+# visualComponent values the lesson schema accepts; the lesson JSON names app components
+# (TemperatureHumidityChart, MicrobeGrowth, ...) that Strapi would reject, those become 'None'
+with open(BASE_PATH / 'api' / 'lesson' / 'content-types' / 'lesson' / 'schema.json', 'r', encoding='utf-8') as f:
+    VISUAL_COMPONENTS = json.load(f)['attributes']['visualComponent']['enum']
+
+# Lesson files per language: source key -> file name pattern
+SOURCES = {
+    'annex1': 'annex1-{lang}.json',
+    'annex1-advanced': 'annex1-advanced-{lang}.json',
+}
+
+# Columns written by the importer, per table (Strapi v5 snake_case names)
+COLUMNS = {
+    'lessons': ['title', 'slug', 'summary', 'content', 'annex_reference', 'visual_component'],
+    'quizzes': ['title'],
+    'questions': ['question_text', 'options', 'correct_index', 'explanation'],
+    'options': ['text'],
+}
+
+# Stand-in for the tables Strapi v5 creates from api/*/content-types/*/schema.json
+STANDIN_SCHEMA = """
+CREATE TABLE IF NOT EXISTS lessons (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, document_id VARCHAR(255),
+    title VARCHAR(255), slug VARCHAR(255), summary TEXT, content TEXT,
+    annex_reference VARCHAR(255), visual_component VARCHAR(255),
+    created_at DATETIME, updated_at DATETIME, published_at DATETIME,
+    created_by_id INTEGER, updated_by_id INTEGER, locale VARCHAR(255)
+);
+CREATE TABLE IF NOT EXISTS quizzes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, document_id VARCHAR(255), title VARCHAR(255),
+    created_at DATETIME, updated_at DATETIME, published_at DATETIME,
+    created_by_id INTEGER, updated_by_id INTEGER, locale VARCHAR(255)
+);
+CREATE TABLE IF NOT EXISTS questions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, document_id VARCHAR(255),
+    question_text TEXT, options JSON, correct_index INTEGER, explanation TEXT,
+    created_at DATETIME, updated_at DATETIME, published_at DATETIME,
+    created_by_id INTEGER, updated_by_id INTEGER, locale VARCHAR(255)
+);
+CREATE TABLE IF NOT EXISTS options (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, document_id VARCHAR(255), text VARCHAR(255),
+    created_at DATETIME, updated_at DATETIME, published_at DATETIME,
+    created_by_id INTEGER, updated_by_id INTEGER, locale VARCHAR(255)
+);
+CREATE TABLE IF NOT EXISTS lessons_quiz_lnk (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, lesson_id INTEGER, quiz_id INTEGER
+);
+CREATE TABLE IF NOT EXISTS quizzes_lesson_lnk (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, quiz_id INTEGER, lesson_id INTEGER
+);
+CREATE TABLE IF NOT EXISTS quizzes_questions_lnk (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, quiz_id INTEGER, question_id INTEGER, question_ord DOUBLE
+);
+CREATE INDEX IF NOT EXISTS lessons_documents_idx ON lessons (document_id, locale, published_at);
+CREATE INDEX IF NOT EXISTS quizzes_documents_idx ON quizzes (document_id, locale, published_at);
+CREATE INDEX IF NOT EXISTS questions_documents_idx ON questions (document_id, locale, published_at);
+CREATE INDEX IF NOT EXISTS options_documents_idx ON options (document_id, locale, published_at);
+"""
+
+# Importer bookkeeping: content hash of every row it wrote
+LEDGER_SCHEMA = """
+CREATE TABLE IF NOT EXISTS content_import_ledger (
+    table_name TEXT NOT NULL, document_id TEXT NOT NULL, locale TEXT NOT NULL,
+    source TEXT NOT NULL, hash TEXT NOT NULL,
+    PRIMARY KEY (table_name, document_id, locale)
+);
+"""
+
+def document_id(*key):
+    """
+    Stable 24 character document id for a content position, e.g. ('question', 'annex1', 101, 3)
+    """
+    return hashlib.sha1(':'.join(str(k) for k in key).encode('utf-8')).hexdigest()[:24]
+
+def content_hash(values):
+    return hashlib.sha1(json.dumps(values, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+def lesson_records(lessons, source):
+    """
+    Map lesson JSON to rows: {table: [(document_id, values)]} plus relation keys
+    """
+    records = {table: [] for table in COLUMNS}
+    quiz_links = []      # (lesson document_id, quiz document_id)
+    question_links = []  # (quiz document_id, question document_id, order)
+
+    for lesson in lessons:
+        lesson_doc = document_id('lesson', source, lesson['id'])
+        quiz_doc = document_id('quiz', source, lesson['id'])
+        content = '\n\n'.join(filter(None, [
+            lesson.get('developmentAndExplanation'),
+            lesson.get('practicalChallenges'),
+            lesson.get('improvementIdeas'),
+        ]))
+        visual = lesson.get('visualComponent')
+        records['lessons'].append((lesson_doc, [
+            lesson['title'], lesson.get('slug'), None, content,
+            lesson.get('annexReference'), visual if visual in VISUAL_COMPONENTS else 'None',
+        ]))
+        records['quizzes'].append((quiz_doc, [lesson['title']]))
+        quiz_links.append((lesson_doc, quiz_doc))
+
+        for pos, q in enumerate(lesson.get('quizQuestions') or []):
+            question_doc = document_id('question', source, lesson['id'], pos)
+            records['questions'].append((question_doc, [
+                q['question'], json.dumps(q['options'], ensure_ascii=False),
+                q['correctAnswerIndex'], q.get('explanation'),
+            ]))
+            question_links.append((quiz_doc, question_doc, pos + 1))
+            for k, option in enumerate(q['options']):
+                records['options'].append((document_id('option', source, lesson['id'], pos, k), [option]))
+
+    return records, quiz_links, question_links
+
+def _batches(rows, columns, conn):
+    """
+    Split rows so each multi-row statement stays under SQLite's bound variable limit
+    """
+    # One variable is kept free for the locale parameter of SELECT/DELETE
+    size = max(1, (conn.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER) - 1) // len(columns))
+    for i in range(0, len(rows), size):
+        yield rows[i:i + size]
+
+def insert_many(conn, table, columns, rows):
+    """
+    Batched multi-row INSERT ... VALUES (...), (...)
+    """
+    placeholder = '(' + ', '.join('?' * len(columns)) + ')'
+    for batch in _batches(rows, columns, conn):
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES {', '.join([placeholder] * len(batch))}"
+        conn.execute(sql, [value for row in batch for value in row])
+
+def select_ids(conn, table, locale, documents, published=True):
+    """
+    document_id -> row id for the given documents in one locale, published or draft rows
+    """
+    ids = {}
+    documents = list(documents)
+    version = 'published_at IS NOT NULL' if published else 'published_at IS NULL'
+    for batch in _batches(documents, [None], conn):
+        sql = (f"SELECT document_id, id FROM {table} "
+               f"WHERE locale = ? AND {version} AND document_id IN ({', '.join('?' * len(batch))})")
+        ids.update(conn.execute(sql, [locale, *batch]).fetchall())
+    return ids
+
+def select_all_ids(conn, table, locale, documents):
+    """
+    Row ids of both versions (draft and published) of the given documents
+    """
+    return [i for published in (False, True) for i in select_ids(conn, table, locale, documents, published).values()]
+
+def delete_documents(conn, table, locale, documents):
+    documents = list(documents)
+    for batch in _batches(documents, [None], conn):
+        conn.execute(f"DELETE FROM {table} WHERE locale = ? AND document_id IN ({', '.join('?' * len(batch))})",
+                     [locale, *batch])
+
+def delete_links(conn, table, column, ids):
+    ids = list(ids)
+    for batch in _batches(ids, [None], conn):
+        conn.execute(f"DELETE FROM {table} WHERE {column} IN ({', '.join('?' * len(batch))})", batch)
+
+def import_file(conn, path, source, locale, full=False):
+    """
+    Upsert one lesson file in a single transaction; returns counts per table
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        lessons = json.load(f)
+    records, quiz_links, question_links = lesson_records(lessons, source)
+    now = int(time.time() * 1000)
+    stats = {}
+
+    with conn:
+        ledger = {}
+        if not full:
+            rows = conn.execute(
+                "SELECT table_name, document_id, hash FROM content_import_ledger WHERE source = ? AND locale = ?",
+                (source, locale))
+            ledger = {(table, doc): h for table, doc, h in rows}
+
+        changed_quizzes = set()
+        ledger_rows = []
+        for table, columns in COLUMNS.items():
+            current = {}
+            for doc, values in records[table]:
+                current[doc] = (values, content_hash(values))
+
+            stale = [doc for (t, doc) in ledger if t == table and doc not in current]
+            if full:
+                stale = [doc for doc, _ in records[table]]
+                stale += [doc for (doc,) in conn.execute(
+                    "SELECT document_id FROM content_import_ledger WHERE table_name = ? AND source = ? AND locale = ?",
+                    (table, source, locale))]
+            new = [doc for doc in current if full or (table, doc) not in ledger]
+            changed = [doc for doc in current
+                       if not full and (table, doc) in ledger and ledger[(table, doc)] != current[doc][1]]
+
+            if stale:
+                if table == 'quizzes':
+                    old_ids = select_all_ids(conn, table, locale, stale)
+                    delete_links(conn, 'quizzes_questions_lnk', 'quiz_id', old_ids)
+                    delete_links(conn, 'quizzes_lesson_lnk', 'quiz_id', old_ids)
+                    delete_links(conn, 'lessons_quiz_lnk', 'quiz_id', old_ids)
+                if table == 'questions':
+                    delete_links(conn, 'quizzes_questions_lnk', 'question_id',
+                                 select_all_ids(conn, table, locale, stale))
+                delete_documents(conn, table, locale, stale)
+                conn.executemany("DELETE FROM content_import_ledger WHERE table_name = ? AND document_id = ? AND locale = ?",
+                                 [(table, doc, locale) for doc in stale])
+
+            # Draft and published row per document
+            insert_many(conn, table, ['document_id', *columns, 'created_at', 'updated_at', 'published_at', 'locale'],
+                        [[doc, *current[doc][0], now, now, published_at, locale]
+                         for doc in new for published_at in (None, now)])
+            if changed:
+                assignments = ', '.join(f"{c} = ?" for c in columns)
+                conn.executemany(f"UPDATE {table} SET {assignments}, updated_at = ? WHERE document_id = ? AND locale = ?",
+                                 [[*current[doc][0], now, doc, locale] for doc in changed])
+
+            ledger_rows += [(table, doc, locale, source, current[doc][1]) for doc in new + changed]
+            stats[table] = {'inserted': len(new), 'updated': len(changed),
+                            'deleted': len(stale) if not full else 0,
+                            'unchanged': len(current) - len(new) - len(changed)}
+            if table in ('quizzes', 'questions'):
+                changed_quizzes.update(new + changed)
+
+        # Relations are rebuilt only for quizzes whose own row or one of whose questions changed
+        question_quiz = {question: quiz for quiz, question, _ in question_links}
+        touched = {question_quiz.get(doc, doc) for doc in changed_quizzes}
+        # Each version links to the same version of the related rows
+        if touched:
+            for published in (False, True):
+                lesson_ids = select_ids(conn, 'lessons', locale, [l for l, q in quiz_links if q in touched], published)
+                quiz_ids = select_ids(conn, 'quizzes', locale, touched, published)
+                question_ids = select_ids(conn, 'questions', locale,
+                                          [question for quiz, question, _ in question_links if quiz in touched],
+                                          published)
+                delete_links(conn, 'quizzes_questions_lnk', 'quiz_id', quiz_ids.values())
+                delete_links(conn, 'quizzes_lesson_lnk', 'quiz_id', quiz_ids.values())
+                delete_links(conn, 'lessons_quiz_lnk', 'quiz_id', quiz_ids.values())
+                links = [(lesson_ids[l], quiz_ids[q]) for l, q in quiz_links if q in quiz_ids]
+                insert_many(conn, 'lessons_quiz_lnk', ['lesson_id', 'quiz_id'], links)
+                insert_many(conn, 'quizzes_lesson_lnk', ['quiz_id', 'lesson_id'], [(q, l) for l, q in links])
+                insert_many(conn, 'quizzes_questions_lnk', ['quiz_id', 'question_id', 'question_ord'],
+                            [(quiz_ids[quiz], question_ids[question], order)
+                             for quiz, question, order in question_links if quiz in quiz_ids])
+
+        ledger_columns = ['table_name', 'document_id', 'locale', 'source', 'hash']
+        for batch in _batches(ledger_rows, ledger_columns, conn):
+            placeholder = ', '.join(['(?, ?, ?, ?, ?)'] * len(batch))
+            conn.execute(f"INSERT OR REPLACE INTO content_import_ledger VALUES {placeholder}",
+                         [value for row in batch for value in row])
+
+    return stats
+
+def import_all(db_path, content_dir=CONTENT_DIR, full=False, standin=False, verbose=True):
+    """
+    Import every lesson file for every language; returns elapsed seconds
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        if standin:
+            conn.executescript(STANDIN_SCHEMA)
+        conn.executescript(LEDGER_SCHEMA)
+        start = time.perf_counter()
+        for lang in LANGUAGES:
+            for source, pattern in SOURCES.items():
+                path = Path(content_dir) / pattern.format(lang=lang)
+                if not path.exists():
+                    if verbose:
+                        print(f"  ⚠️ Missing {path.name}, skipping")
+                    continue
+                stats = import_file(conn, path, source, lang, full=full)
+                if verbose:
+                    summary = ', '.join(f"{table} +{s['inserted']} ~{s['updated']} -{s['deleted']} ={s['unchanged']}"
+                                        for table, s in stats.items())
+                    print(f"  ✓ {path.name}: {summary}")
+        return time.perf_counter() - start
+    finally:
+        conn.close()
+
+def benchmark(content_dir=CONTENT_DIR):
+    """
+    Time a full reload into an empty stand-in against an incremental run with nothing changed
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / 'bench.sqlite'
+        first = import_all(db_path, content_dir, standin=True, verbose=False)
+        full = import_all(db_path, content_dir, full=True, standin=True, verbose=False)
+        incremental = import_all(db_path, content_dir, standin=True, verbose=False)
+    print("\n" + "="*70)
+    print("IMPORT BENCHMARK (stand-in schema)")
+    print("="*70)
+    print(f"  Empty database:      {first * 1000:8.1f} ms")
+    print(f"  Full reload:         {full * 1000:8.1f} ms")
+    print(f"  Incremental (no-op): {incremental * 1000:8.1f} ms")
+    print("="*70 + "\n")
+
+def main():
+    parser = argparse.ArgumentParser(description="Import annex1 lesson JSON into the Strapi database")
+    parser.add_argument('--db', help=f"SQLite database (default: {STRAPI_DB}, or {STANDIN_DB} with --standin)")
+    parser.add_argument('--standin', action='store_true', help="create the stand-in schema if missing")
+    parser.add_argument('--content', default=str(CONTENT_DIR), help="directory with annex1-*.json")
+    parser.add_argument('--full', action='store_true', help="ignore the hash ledger and rewrite every row")
+    parser.add_argument('--bench', action='store_true', help="time full against incremental reload")
+    args = parser.parse_args()
+
+    if args.bench:
+        benchmark(args.content)
+        return
+
+    db_path = Path(args.db or (STANDIN_DB if args.standin else STRAPI_DB))
+    if not args.standin and not db_path.exists():
+        print(f"ERROR: {db_path} not found. Start Strapi once or use --standin.")
+        return
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+
+    print(f"\nImporting into {db_path}{' (full reload)' if args.full else ''}")
+    elapsed = import_all(db_path, args.content, full=args.full, standin=args.standin)
+    print(f"\n✅ Done in {elapsed * 1000:.1f} ms\n")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Item analysis of quiz attempts exported from Strapi (quiz_attempts) or the mock store
+Streams JSONL/CSV/JSON exports into NumPy arrays and computes per question:
+difficulty (p-value), point-biserial discrimination (corrected item-total),
+distractor selection rates and the lesson's time-to-complete distribution.
+Questions are joined back to their position in annex1-*.json. Strapi records name
+the lesson through the populated relation (slug or the document_id written by
+import_content.py); the relation's row id alone cannot be mapped to an annex1 lesson.
+
+Usage:
+    python quiz_item_analysis.py attempts.jsonl [more exports...]
+    python quiz_item_analysis.py attempts.csv --output item-analysis.json --min-responses 50
+"""
+
+import argparse
+import csv
+import json
+import time
+from array import array
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from import_content import SOURCES, document_id
+
+BASE_PATH = Path(__file__).resolve().parent.parent
+CONTENT_DIR = BASE_PATH.parent / 'app-v2' / 'src' / 'content'
+
+LANGUAGES = ['sl', 'en', 'hr']
+
+# Options per question are stored as columns 1..MAX_OPTIONS; column 0 counts unanswered
+MAX_OPTIONS = 8
+
+# Classical test theory thresholds
+TOO_HARD = 0.2
+TOO_EASY = 0.9
+WEAK_DISCRIMINATION = 0.2
+DEAD_DISTRACTOR = 0.05
+
+TIME_PERCENTILES = [10, 50, 90]
+
+def load_catalog(content_dir=CONTENT_DIR):
+    """
+    Index every quiz question by (file, lesson id, position), and question text -> item key in all languages.
+    Lesson ids are not unique across files (113 is in both), so lesson id -> file follows the app's load order;
+    slugs and Strapi document ids name the file exactly.
+    """
+    items = {}
+    by_text = {}
+    lesson_files = {}
+    lesson_refs = {}
+    for lang in LANGUAGES:
+        for source, pattern in SOURCES.items():
+            path = Path(content_dir) / pattern.format(lang=lang)
+            if not path.exists():
+                continue
+            with open(path, 'r', encoding='utf-8') as f:
+                lessons = json.load(f)
+            file_name = pattern.format(lang='sl')
+            for lesson in lessons:
+                questions = lesson.get('quizQuestions') or []
+                lesson_files.setdefault(lesson['id'], (file_name, len(questions)))
+                ref = (lesson['id'], file_name, len(questions))
+                lesson_refs.setdefault(document_id('lesson', source, lesson['id']), ref)
+                if lesson.get('slug'):
+                    lesson_refs.setdefault(lesson['slug'], ref)
+                for pos, q in enumerate(questions):
+                    key = (file_name, lesson['id'], pos)
+                    # Slovenian is loaded first and is the reference text in the report
+                    items.setdefault(key, {
+                        'lessonId': lesson['id'],
+                        'position': pos,
+                        'file': file_name,
+                        'question': q['question'],
+                        'options': q['options'],
+                        'correctIndex': q['correctAnswerIndex'],
+                    })
+                    by_text.setdefault(q['question'].strip(), key)
+    return items, by_text, lesson_files, lesson_refs
+
+def _parse_time(value):
+    """
+    Epoch milliseconds or ISO 8601 string -> seconds, None if missing
+    """
+    if value in (None, ''):
+        return None
+    if isinstance(value, (int, float)):
+        return value / 1000
+    try:
+        return float(value) / 1000
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(str(value).replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return None
+
+def _json_field(value):
+    if isinstance(value, str):
+        try:
+            return json.loads(value) if value else None
+        except json.JSONDecodeError:
+            return None
+    return value
+
+def read_attempts(path):
+    """
+    Yield attempt records from a JSONL, JSON array or CSV export, one at a time
+    """
+    path = Path(path)
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if path.suffix == '.csv':
+            yield from csv.DictReader(f)
+        elif path.suffix == '.json':
+            data = json.load(f)
+            yield from (data.get('data', []) if isinstance(data, dict) else data)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+def _lesson_refs(relation):
+    """
+    Slug and document id of a populated Strapi lesson relation (v4 {data: {id, attributes}}
+    or v5 {id, documentId, slug}); a bare string is taken as either
+    """
+    if isinstance(relation, str):
+        return [relation]
+    if not isinstance(relation, dict):
+        return []
+    relation = relation.get('data', relation)
+    if not isinstance(relation, dict):
+        return []
+    if isinstance(relation.get('attributes'), dict):
+        relation = {**relation, **relation['attributes']}
+    return [relation[k] for k in ('slug', 'documentId', 'document_id') if relation.get(k)]
+
+def normalize_attempt(record):
+    """
+    Flatten Strapi ({id, attributes}, lesson relation) and mock (lessonId, review) records.
+    lessonId is the annex1 lesson id from mock records; Strapi relations give lessonRefs.
+    """
+    if isinstance(record.get('attributes'), dict):
+        record = {'id': record.get('id'), **record['attributes']}
+    try:
+        lesson = int(record.get('lessonId'))
+    except (TypeError, ValueError):
+        lesson = None
+    return {
+        'lessonId': lesson,
+        'lessonRefs': _lesson_refs(_json_field(record.get('lesson'))),
+        'answers': _json_field(record.get('answers')) or [],
+        'review': _json_field(record.get('review')) or [],
+        'startedAt': _parse_time(record.get('startedAt')),
+        'finishedAt': _parse_time(record.get('finishedAt')),
+    }
+
+def collect_responses(paths, catalog):
+    """
+    Stream all exports into flat NumPy arrays of responses and per-attempt data
+    """
+    items, by_text, lesson_files, lesson_refs = catalog
+    item_index = {key: i for i, key in enumerate(sorted(items))}
+
+    resp_attempt = array('i')
+    resp_item = array('i')
+    resp_selected = array('b')
+    resp_correct = array('b')
+    attempt_lesson = array('i')
+    attempt_duration = array('d')
+    skipped = 0
+    unresolved = 0
+
+    for path in paths:
+        for record in read_attempts(path):
+            attempt = normalize_attempt(record)
+            answers = attempt['answers']
+            if not isinstance(answers, list):
+                skipped += 1
+                continue
+            if attempt['lessonId'] in lesson_files:
+                lesson_id = attempt['lessonId']
+                file_name, size = lesson_files[lesson_id]
+            else:
+                ref = next((lesson_refs[r] for r in attempt['lessonRefs'] if r in lesson_refs), None)
+                if ref is None:
+                    unresolved += 1
+                    continue
+                lesson_id, file_name, size = ref
+            review = attempt['review'] if isinstance(attempt['review'], list) else []
+            attempt_id = len(attempt_lesson)
+            added = 0
+
+            for i, selected in enumerate(answers):
+                key = None
+                # Review text identifies questions borrowed from other lessons
+                if i < len(review) and isinstance(review[i], dict) and review[i].get('question'):
+                    key = by_text.get(str(review[i]['question']).strip())
+                if key is None and i < size:
+                    key = (file_name, lesson_id, i)
+                if key is None:
+                    continue
+                try:
+                    selected = int(selected)
+                except (TypeError, ValueError):
+                    selected = -1
+                if not -1 <= selected < MAX_OPTIONS:
+                    selected = -1
+                resp_attempt.append(attempt_id)
+                resp_item.append(item_index[key])
+                resp_selected.append(selected)
+                resp_correct.append(1 if selected == items[key]['correctIndex'] else 0)
+                added += 1
+
+            if not added:
+                skipped += 1
+                continue
+            attempt_lesson.append(lesson_id)
+            started, finished = attempt['startedAt'], attempt['finishedAt']
+            attempt_duration.append(finished - started if started and finished and finished >= started else np.nan)
+
+    return {
+        'keys': sorted(items),
+        'attempt': np.frombuffer(resp_attempt, dtype=np.int32),
+        'item': np.frombuffer(resp_item, dtype=np.int32),
+        'selected': np.frombuffer(resp_selected, dtype=np.int8),
+        'correct': np.frombuffer(resp_correct, dtype=np.int8).astype(np.float64),
+        'attempt_lesson': np.frombuffer(attempt_lesson, dtype=np.int32),
+        'attempt_duration': np.frombuffer(attempt_duration, dtype=np.float64),
+        'skipped': skipped,
+        'unresolved': unresolved,
+    }
+
+def analyse(data):
+    """
+    Vectorised item statistics; returns arrays indexed like data['keys']
+    """
+    n_items = len(data['keys'])
+    attempt, item, correct = data['attempt'], data['item'], data['correct']
+    n_attempts = len(data['attempt_lesson'])
+
+    # Rest score: share of the attempt's other questions answered correctly
+    attempt_n = np.bincount(attempt, minlength=n_attempts).astype(np.float64)
+    attempt_score = np.bincount(attempt, weights=correct, minlength=n_attempts)
+    others = attempt_n[attempt] - 1
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rest = np.where(others > 0, (attempt_score[attempt] - correct) / others, np.nan)
+
+    n = np.bincount(item, minlength=n_items).astype(np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        difficulty = np.bincount(item, weights=correct, minlength=n_items) / n
+
+        # Point-biserial = Pearson correlation of the 0/1 item score with the rest score
+        valid = ~np.isnan(rest)
+        vi, x, y = item[valid], correct[valid], rest[valid]
+        m = np.bincount(vi, minlength=n_items).astype(np.float64)
+        sx = np.bincount(vi, weights=x, minlength=n_items)
+        sy = np.bincount(vi, weights=y, minlength=n_items)
+        sxy = np.bincount(vi, weights=x * y, minlength=n_items)
+        syy = np.bincount(vi, weights=y * y, minlength=n_items)
+        cov = m * sxy - sx * sy
+        var = (m * sx - sx * sx) * (m * syy - sy * sy)
+        discrimination = np.where(var > 0, cov / np.sqrt(var), np.nan)
+
+        # Column 0 = unanswered, column k + 1 = option k
+        width = MAX_OPTIONS + 1
+        counts = np.bincount(item * width + data['selected'].astype(np.int32) + 1, minlength=n_items * width)
+        option_rates = counts.reshape(n_items, width) / n[:, None]
+
+    return {'n': n, 'difficulty': difficulty, 'discrimination': discrimination, 'option_rates': option_rates}
+
+def time_distributions(data):
+    """
+    Percentiles of attempt duration (seconds) per lesson
+    """
+    lessons, durations = data['attempt_lesson'], data['attempt_duration']
+    known = ~np.isnan(durations)
+    lessons, durations = lessons[known], durations[known]
+    if not len(lessons):
+        return {}
+    order = np.argsort(lessons, kind='stable')
+    lessons, durations = lessons[order], durations[order]
+    ids, starts = np.unique(lessons, return_index=True)
+    result = {}
+    for lesson_id, group in zip(ids, np.split(durations, starts[1:])):
+        values = np.percentile(group, TIME_PERCENTILES)
+        result[int(lesson_id)] = {
+            'attempts': int(len(group)),
+            **{f'p{p}': round(float(v), 1) for p, v in zip(TIME_PERCENTILES, values)},
+        }
+    return result
+
+def build_report(catalog, data, stats, times, min_responses):
+    """
+    Join statistics back to annex1 questions and flag weak items and dead distractors
+    """
+    items = catalog[0]
+    report = []
+    for i, key in enumerate(data['keys']):
+        n = int(stats['n'][i])
+        if n == 0:
+            continue
+        item = items[key]
+        p = float(stats['difficulty'][i])
+        r = stats['discrimination'][i]
+        rates = stats['option_rates'][i]
+        flags = []
+        dead = []
+        if n >= min_responses:
+            if p < TOO_HARD:
+                flags.append('too-hard')
+            if p > TOO_EASY:
+                flags.append('too-easy')
+            if not np.isnan(r) and r < WEAK_DISCRIMINATION:
+                flags.append('negative-discrimination' if r < 0 else 'weak-discrimination')
+            dead = [k for k in range(len(item['options']))
+                    if k != item['correctIndex'] and rates[k + 1] < DEAD_DISTRACTOR]
+            if dead:
+                flags.append('dead-distractor')
+        report.append({
+            **item,
+            'responses': n,
+            'difficulty': round(p, 3),
+            'discrimination': None if np.isnan(r) else round(float(r), 3),
+            'unanswered': round(float(rates[0]), 3),
+            'optionRates': [round(float(rates[k + 1]), 3) for k in range(len(item['options']))],
+            'deadDistractors': dead,
+            'time': times.get(item['lessonId']),
+            'flags': flags,
+        })
+    return report
+
+def print_report(report, data, times, elapsed):
+    flagged = [r for r in report if r['flags']]
+    print("\n" + "="*80)
+    print("QUIZ ITEM ANALYSIS")
+    print("="*80)
+    print(f"Attempts: {len(data['attempt_lesson']):,}   Responses: {len(data['item']):,}   "
+          f"Questions: {len(report)}   Skipped records: {data['skipped']}   ({elapsed:.2f}s)")
+    if data['unresolved']:
+        print(f"⚠️ Unresolved lessons: {data['unresolved']} attempts name a lesson that matches no annex1 slug or "
+              f"document id (export Strapi attempts with populate=lesson)")
+    if times:
+        print(f"Time to complete: {sum(t['attempts'] for t in times.values()):,} timed attempts "
+              f"in {len(times)} lessons (see --output)")
+    else:
+        print("Time to complete: not available - no attempt has both startedAt and finishedAt "
+              "(the app does not send startedAt yet)")
+    print(f"Flagged questions: {len(flagged)}")
+
+    for r in sorted(flagged, key=lambda r: (r['discrimination'] if r['discrimination'] is not None else 1)):
+        rpb = f"{r['discrimination']:+.2f}" if r['discrimination'] is not None else "  n/a"
+        print(f"\n⚠️ Lesson {r['lessonId']} Q{r['position'] + 1} ({r['file']}) - {', '.join(r['flags'])}")
+        print(f"   {r['question'][:90]}")
+        print(f"   n={r['responses']}  p={r['difficulty']:.2f}  r_pb={rpb}  unanswered={r['unanswered']:.0%}")
+        for k, (option, rate) in enumerate(zip(r['options'], r['optionRates'])):
+            mark = "✓" if k == r['correctIndex'] else ("✗" if k in r['deadDistractors'] else " ")
+            print(f"     {mark} {rate:6.1%}  {option[:70]}")
+    print("="*80 + "\n")
+
+def main():
+    parser = argparse.ArgumentParser(description="Item analysis of quiz attempt exports")
+    parser.add_argument('exports', nargs='+', help="JSONL, JSON or CSV exports of quiz attempts")
+    parser.add_argument('--content', default=str(CONTENT_DIR), help="directory with annex1-*.json")
+    parser.add_argument('--output', help="write the full per-question report as JSON")
+    parser.add_argument('--min-responses', type=int, default=30, help="minimum responses before flagging")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    catalog = load_catalog(args.content)
+    data = collect_responses(args.exports, catalog)
+    stats = analyse(data)
+    times = time_distributions(data)
+    report = build_report(catalog, data, stats, times, args.min_responses)
+    elapsed = time.perf_counter() - start
+
+    print_report(report, data, times, elapsed)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"💾 Saved report to {args.output}")
+
+if __name__ == '__main__':
+    main()
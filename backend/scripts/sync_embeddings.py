@@ -0,0 +1,460 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Incremental sync of lesson embeddings into the vector store used by knowledge-cosmos.js
+All lesson sections of every language are cut into paragraph chunks and hashed.
+A local sync ledger remembers which chunks the store already holds, so a re-sync
+only embeds new or changed chunks (in large batched embedding requests), upserts
+them with bulk operations and removes chunks that disappeared from the lessons.
+
+Documents have the same shape upsertDocuments() writes, so vectorSearch() finds them.
+
+Usage:
+    python sync_embeddings.py                        # Azure OpenAI + Cosmos DB from backend/.env
+    python sync_embeddings.py --dry-run              # only show what would be embedded/deleted
+    python sync_embeddings.py --standin              # local embedding server + database/vectors.sqlite
+    python sync_embeddings.py --serve-embeddings 8089
+        # run only the stand-in embedding endpoint (AZURE_OPENAI_ENDPOINT=http://127.0.0.1:8089)
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import re
+import sqlite3
+import struct
+import threading
+import time
+import unicodedata
+import urllib.error
+import urllib.request
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+BASE_PATH = Path(__file__).resolve().parent.parent
+CONTENT_DIR = BASE_PATH.parent / 'app-v2' / 'src' / 'content'
+LEDGER_DB = BASE_PATH / 'database' / 'embedding_ledger.sqlite'
+STANDIN_VECTORS = BASE_PATH / 'database' / 'vectors.sqlite'
+
+LANGUAGES = ['sl', 'en', 'hr']
+
+# Both lesson files are one source for vectorSearch() ('Annex 1' -> 'annex1')
+SOURCE = 'annex1'
+LESSON_FILES = ['annex1-{lang}.json', 'annex1-advanced-{lang}.json']
+
+SECTIONS = [
+    ('developmentAndExplanation', 'development'),
+    ('practicalChallenges', 'challenges'),
+    ('improvementIdeas', 'improvements'),
+]
+
+# Paragraphs are packed into chunks of at most this many characters
+CHUNK_CHARS = 1500
+
+# upsertDocuments() cuts text at 8000 characters as well
+MAX_TEXT = 8000
+
+# One embedding request carries up to this many inputs / characters (API limit is 2048 inputs)
+EMBED_BATCH = 256
+EMBED_BATCH_CHARS = 120000
+
+# Cosmos transactional batch: max 100 operations and 2 MB; a 1536-float vector is ~30 KB of JSON
+STORE_BATCH = 50
+
+DIMENSIONS = 1536
+
+LEDGER_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embedding_ledger (
+    target TEXT NOT NULL, id TEXT NOT NULL, tenant_id TEXT NOT NULL, source TEXT NOT NULL,
+    lang TEXT NOT NULL, hash TEXT NOT NULL, synced_at TEXT NOT NULL,
+    PRIMARY KEY (target, id)
+);
+"""
+
+STANDIN_SCHEMA = """
+CREATE TABLE IF NOT EXISTS vectors (
+    id TEXT PRIMARY KEY, tenant_id TEXT, source TEXT, url TEXT, title TEXT, lang TEXT,
+    text TEXT, vector BLOB, created_at TEXT
+);
+"""
+
+WORD_RE = re.compile(r'[^\W_]+')
+
+def load_env(path=BASE_PATH / '.env'):
+    """
+    Read KEY=VALUE lines from backend/.env like dotenv (existing variables win)
+    """
+    if not path.exists():
+        return
+    for line in path.read_text(encoding='utf-8').splitlines():
+        line = line.strip()
+        if line and not line.startswith('#') and '=' in line:
+            key, value = line.split('=', 1)
+            os.environ.setdefault(key.strip(), value.strip().strip('"\''))
+
+def paragraphs(text):
+    return [p.strip() for p in (text or '').split('\n') if p.strip()]
+
+def pack(parts, limit=CHUNK_CHARS):
+    """
+    Greedily join consecutive paragraphs into chunks of up to limit characters
+    """
+    chunks, current = [], []
+    for part in parts:
+        if current and len('\n'.join(current + [part])) > limit:
+            chunks.append('\n'.join(current))
+            current = []
+        current.append(part)
+    if current:
+        chunks.append('\n'.join(current))
+    return chunks
+
+def lesson_chunks(lang, content_dir=CONTENT_DIR):
+    """
+    All section chunks of one language as dicts with a content-derived id and hash.
+    The id contains the hash, so an edited chunk becomes a new document and the old
+    one is deleted, while unchanged chunks keep their ids wherever they move.
+    """
+    chunks = []
+    for pattern in LESSON_FILES:
+        path = Path(content_dir) / pattern.format(lang=lang)
+        if not path.exists():
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            lessons = json.load(f)
+        for lesson in lessons:
+            seen = set()
+            for field, section in SECTIONS:
+                for body in pack(paragraphs(lesson.get(field))):
+                    # Title first so the chunk embeds with its lesson context
+                    text = f"{lesson['title']}\n\n{body}"[:MAX_TEXT]
+                    digest = hashlib.sha1(text.encode('utf-8')).hexdigest()
+                    chunk_id = f"{lang}-{lesson['slug']}-{section}-{digest[:16]}"
+                    n = 1
+                    while chunk_id in seen:  # identical chunk twice in one lesson
+                        n += 1
+                        chunk_id = f"{lang}-{lesson['slug']}-{section}-{digest[:16]}-{n}"
+                    seen.add(chunk_id)
+                    chunks.append({
+                        'id': chunk_id,
+                        'hash': digest,
+                        'lang': lang,
+                        'title': lesson['title'],
+                        'url': f"/lessons/{lesson['slug']}",
+                        'text': text,
+                    })
+    return chunks
+
+# ---------------------------------------------------------------------------
+# Embedding endpoint
+# ---------------------------------------------------------------------------
+
+class AzureEmbedder:
+    """Azure OpenAI embeddings deployment, many inputs per request"""
+
+    def __init__(self, endpoint, api_key, deployment, api_version):
+        self.url = (f"{endpoint.rstrip('/')}/openai/deployments/{deployment}"
+                    f"/embeddings?api-version={api_version}")
+        self.api_key = api_key
+        self.requests = 0
+
+    def embed(self, texts, max_retries=3):
+        body = json.dumps({'input': texts}).encode('utf-8')
+        for attempt in range(1, max_retries + 2):
+            request = urllib.request.Request(self.url, data=body, method='POST', headers={
+                'Content-Type': 'application/json',
+                'api-key': self.api_key,
+            })
+            try:
+                self.requests += 1
+                with urllib.request.urlopen(request, timeout=120) as response:
+                    data = json.load(response)['data']
+                return [item['embedding'] for item in sorted(data, key=lambda item: item['index'])]
+            except urllib.error.HTTPError as e:
+                if e.code == 429 and attempt <= max_retries:
+                    time.sleep(int(e.headers.get('retry-after') or attempt))
+                    continue
+                raise RuntimeError(f"Embeddings error {e.code}: {e.read().decode('utf-8', 'replace')}")
+
+def standin_vector(text, dimensions=DIMENSIONS):
+    """
+    Deterministic bag-of-words vector (hashing trick) - similar texts get similar
+    vectors, which is enough to exercise vectorSearch() without Azure OpenAI
+    """
+    folded = ''.join(c for c in unicodedata.normalize('NFD', text.lower()) if not unicodedata.combining(c))
+    vector = [0.0] * dimensions
+    for word in WORD_RE.findall(folded):
+        h = int.from_bytes(hashlib.blake2b(word.encode('utf-8'), digest_size=8).digest(), 'little')
+        vector[h % dimensions] += 1.0 if (h >> 32) & 1 else -1.0
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [round(v / norm, 6) for v in vector]
+
+class StandinEmbeddingHandler(BaseHTTPRequestHandler):
+    """Answers POST .../embeddings in the Azure OpenAI response format"""
+
+    def do_POST(self):
+        if not self.path.split('?')[0].endswith('/embeddings'):
+            self.send_error(404)
+            return
+        payload = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+        inputs = payload['input'] if isinstance(payload['input'], list) else [payload['input']]
+        tokens = sum(len(text) // 4 for text in inputs)
+        body = json.dumps({
+            'object': 'list',
+            'model': 'standin',
+            'data': [{'object': 'embedding', 'index': i, 'embedding': standin_vector(text)}
+                     for i, text in enumerate(inputs)],
+            'usage': {'prompt_tokens': tokens, 'total_tokens': tokens},
+        }).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_standin_server(port=0):
+    """
+    Stand-in embedding endpoint on 127.0.0.1 in a background thread; returns its base URL
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', port), StandinEmbeddingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}", server
+
+# ---------------------------------------------------------------------------
+# Vector stores
+# ---------------------------------------------------------------------------
+
+class CosmosStore:
+    """The Cosmos DB container knowledge-cosmos.js queries (partition key /tenantId, /source)"""
+
+    def __init__(self, endpoint, key, database, container):
+        try:
+            from azure.cosmos import CosmosClient
+        except ImportError:
+            raise RuntimeError("azure-cosmos is not installed: pip install azure-cosmos")
+        client = CosmosClient(endpoint, credential=key)
+        self.container = client.get_database_client(database).get_container_client(container)
+        self.target = f"cosmos:{endpoint}/{database}/{container}"
+        self.round_trips = 0
+
+    def _batches(self, operations):
+        # Transactional batches must share one partition key
+        groups = {}
+        for partition_key, operation in operations:
+            groups.setdefault(partition_key, []).append(operation)
+        for partition_key, ops in groups.items():
+            for i in range(0, len(ops), STORE_BATCH):
+                yield list(partition_key), ops[i:i + STORE_BATCH]
+
+    def upsert(self, docs):
+        for partition_key, batch in self._batches([((d['tenantId'], d['source']), ('upsert', (d,))) for d in docs]):
+            self.container.execute_item_batch(batch, partition_key=partition_key)
+            self.round_trips += 1
+
+    def delete(self, keys):
+        """
+        Delete in transactional batches. One item that is already gone (removed by hand,
+        or by a run that crashed before updating the ledger) fails its whole batch, so
+        that batch is redone item by item with 404 counted as deleted.
+        """
+        from azure.cosmos.exceptions import CosmosBatchOperationError, CosmosResourceNotFoundError
+        operations = [((tenant_id, source), ('delete', (doc_id,))) for doc_id, tenant_id, source in keys]
+        for partition_key, batch in self._batches(operations):
+            self.round_trips += 1
+            try:
+                self.container.execute_item_batch(batch, partition_key=partition_key)
+                continue
+            except CosmosBatchOperationError as e:
+                if e.operation_responses[e.error_index].get('statusCode') != 404:
+                    raise
+            for _, (doc_id,) in batch:
+                self.round_trips += 1
+                try:
+                    self.container.delete_item(doc_id, partition_key=partition_key)
+                except CosmosResourceNotFoundError:
+                    pass
+
+class SqliteStore:
+    """Local stand-in for the Cosmos container (float32 vectors in a BLOB)"""
+
+    def __init__(self, path):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(STANDIN_SCHEMA)
+        self.target = f"sqlite:{Path(path).resolve()}"
+        self.round_trips = 0
+
+    def upsert(self, docs):
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO vectors (id, tenant_id, source, url, title, lang, text, vector, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(d['id'], d['tenantId'], d['source'], d['url'], d['title'], d['lang'], d['text'],
+                  struct.pack(f'{len(d["vector"])}f', *d['vector']), d['createdAt']) for d in docs])
+        self.round_trips += 1
+
+    def delete(self, keys):
+        with self.conn:
+            self.conn.executemany("DELETE FROM vectors WHERE id = ?", [(doc_id,) for doc_id, _, _ in keys])
+        self.round_trips += 1
+
+# ---------------------------------------------------------------------------
+# Sync
+# ---------------------------------------------------------------------------
+
+def embed_batches(chunks):
+    """
+    Split chunks into embedding requests bounded by input count and characters
+    """
+    batch, chars = [], 0
+    for chunk in chunks:
+        if batch and (len(batch) >= EMBED_BATCH or chars + len(chunk['text']) > EMBED_BATCH_CHARS):
+            yield batch
+            batch, chars = [], 0
+        batch.append(chunk)
+        chars += len(chunk['text'])
+    if batch:
+        yield batch
+
+def open_ledger(path=LEDGER_DB):
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.executescript(LEDGER_SCHEMA)
+    return conn
+
+def plan_sync(chunks, ledger, target, langs, full=False):
+    """
+    Compare chunks of langs with the ledger: (to_embed, to_delete, unchanged count)
+    """
+    marks = ','.join('?' * len(langs))
+    known = dict(ledger.execute(
+        f"SELECT id, hash FROM embedding_ledger WHERE target = ? AND lang IN ({marks})", (target, *langs)))
+    current = {c['id'] for c in chunks}
+    to_embed = [c for c in chunks if full or known.get(c['id']) != c['hash']]
+    to_delete = [doc_id for doc_id in known if doc_id not in current]
+    return to_embed, to_delete, len(chunks) - len(to_embed)
+
+def ledger_target(store, tenant_id):
+    """
+    Ledger namespace: one per store and tenant
+    """
+    return f"{store.target}#{tenant_id}"
+
+def sync(chunks, ledger, store, embedder, tenant_id, langs, full=False):
+    """
+    Embed and upsert new/changed chunks, delete removed ones; the ledger is
+    updated after each successful store write, so an interrupted sync resumes
+    """
+    target = ledger_target(store, tenant_id)
+    to_embed, to_delete, unchanged = plan_sync(chunks, ledger, target, langs, full)
+
+    for batch in embed_batches(to_embed):
+        vectors = embedder.embed([c['text'] for c in batch])
+        now = datetime.now(timezone.utc).isoformat()
+        docs = [{
+            'id': c['id'],
+            'tenantId': tenant_id,
+            'source': SOURCE,
+            'url': c['url'],
+            'title': c['title'],
+            'lang': c['lang'],
+            'text': c['text'],
+            'vector': vector,
+            'createdAt': now,
+        } for c, vector in zip(batch, vectors)]
+        store.upsert(docs)
+        with ledger:
+            ledger.executemany(
+                "INSERT OR REPLACE INTO embedding_ledger (target, id, tenant_id, source, lang, hash, synced_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(target, c['id'], tenant_id, SOURCE, c['lang'], c['hash'], now) for c in batch])
+        print(f"   ↑ embedded and upserted {len(batch)} chunks")
+
+    if to_delete:
+        store.delete([(doc_id, tenant_id, SOURCE) for doc_id in to_delete])
+        with ledger:
+            ledger.executemany("DELETE FROM embedding_ledger WHERE target = ? AND id = ?",
+                               [(target, doc_id) for doc_id in to_delete])
+        print(f"   ✗ deleted {len(to_delete)} chunks")
+
+    return {'chunks': len(chunks), 'unchanged': unchanged, 'embedded': len(to_embed), 'deleted': len(to_delete)}
+
+def main():
+    parser = argparse.ArgumentParser(description="Sync lesson chunk embeddings into the vector store")
+    parser.add_argument('--standin', action='store_true',
+                        help="use a local embedding server and a SQLite vector store instead of Azure")
+    parser.add_argument('--vectors', default=str(STANDIN_VECTORS), help="stand-in vector store (with --standin)")
+    parser.add_argument('--ledger', default=str(LEDGER_DB), help="sync ledger database")
+    parser.add_argument('--content', default=str(CONTENT_DIR), help="directory with annex1-*.json")
+    parser.add_argument('--lang', choices=LANGUAGES, help="only this language (default: all)")
+    parser.add_argument('--full', action='store_true', help="ignore the ledger and re-embed every chunk")
+    parser.add_argument('--dry-run', action='store_true', help="only report what would change")
+    parser.add_argument('--serve-embeddings', type=int, metavar='PORT',
+                        help="run only the stand-in embedding endpoint on this port")
+    args = parser.parse_args()
+
+    if args.serve_embeddings is not None:
+        url, server = start_standin_server(args.serve_embeddings)
+        print(f"Stand-in embedding endpoint on {url} (Ctrl+C to stop)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            server.shutdown()
+        return
+
+    load_env()
+    tenant_id = os.environ.get('COSMOS_TENANT') or 'public'
+
+    if args.standin:
+        endpoint, _ = start_standin_server()
+        embedder = AzureEmbedder(endpoint, 'standin', 'standin', 'standin')
+        store = SqliteStore(args.vectors)
+    else:
+        missing = [name for name in ('COSMOS_ENDPOINT', 'COSMOS_KEY', 'AZURE_OPENAI_ENDPOINT', 'AZURE_OPENAI_API_KEY')
+                   if not os.environ.get(name)]
+        if missing:
+            print(f"ERROR: missing {', '.join(missing)} in backend/.env (or use --standin)")
+            return
+        embedder = AzureEmbedder(os.environ['AZURE_OPENAI_ENDPOINT'], os.environ['AZURE_OPENAI_API_KEY'],
+                                 os.environ.get('AZURE_OPENAI_EMBEDDING_DEPLOYMENT') or 'text-embedding-3-small',
+                                 os.environ.get('AZURE_OPENAI_API_VERSION') or '2024-02-15-preview')
+        store = CosmosStore(os.environ['COSMOS_ENDPOINT'], os.environ['COSMOS_KEY'],
+                            os.environ.get('COSMOS_DB') or 'hvac_knowledge',
+                            os.environ.get('COSMOS_CONTAINER') or 'knowledge')
+
+    ledger = open_ledger(args.ledger)
+    langs = [args.lang] if args.lang else LANGUAGES
+    chunks = [c for lang in langs for c in lesson_chunks(lang, args.content)]
+
+    print("\n" + "="*70)
+    print(f"EMBEDDING SYNC → {store.target} (tenant {tenant_id})")
+    print("="*70)
+
+    if args.dry_run:
+        to_embed, to_delete, unchanged = plan_sync(chunks, ledger, ledger_target(store, tenant_id), langs, args.full)
+        print(f"\n   Chunks:    {len(chunks)}")
+        print(f"   Unchanged: {unchanged}")
+        print(f"   To embed:  {len(to_embed)} in {len(list(embed_batches(to_embed)))} request(s)")
+        print(f"   To delete: {len(to_delete)}")
+        print("\n" + "="*70 + "\n")
+        return
+
+    start = time.perf_counter()
+    stats = sync(chunks, ledger, store, embedder, tenant_id, langs, args.full)
+
+    print("\n" + "-"*70)
+    print(f"Chunks: {stats['chunks']}, unchanged: {stats['unchanged']}, "
+          f"embedded: {stats['embedded']}, deleted: {stats['deleted']}")
+    print(f"Embedding requests: {embedder.requests}, store round trips: {store.round_trips} "
+          f"(one by one: {stats['embedded']} embedding calls + {stats['embedded']} upserts)")
+    print(f"✅ Done in {time.perf_counter() - start:.2f}s")
+    print("="*70 + "\n")
+
+if __name__ == '__main__':
+    main()